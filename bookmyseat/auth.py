@@ -0,0 +1,90 @@
+"""
+Authentication middleware that keeps the logged-in user in the cache.
+
+Django's ``AuthenticationMiddleware`` loads the ``auth_user`` row on every
+request that touches ``request.user``. This one keeps the user object in
+the cache for ``AUTH_USER_CACHE_SECONDS``. The session auth hash is still
+checked against the cached user, and any save or delete of a ``User``
+(profile updates, password changes, ``last_login``) drops the entry.
+Setting ``AUTH_USER_CACHE_SECONDS = 0`` turns the cache off.
+"""
+
+from functools import partial
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+
+def _cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def _timeout():
+    return getattr(settings, "AUTH_USER_CACHE_SECONDS", 300)
+
+
+def _verified(user, session_hash):
+    return bool(session_hash) and constant_time_compare(session_hash, user.get_session_auth_hash())
+
+
+def get_cached_user(request):
+    if not hasattr(request, "_cached_user"):
+        user_id = request.session.get(SESSION_KEY)
+        user = None
+
+        if user_id is not None and _timeout():
+            user = cache.get(_cache_key(user_id))
+            if user is not None and not _verified(user, request.session.get(HASH_SESSION_KEY)):
+                user = None
+
+        if user is None:
+            # Also handles fallback secrets and flushes sessions that don't verify
+            user = auth.get_user(request)
+            if user.is_authenticated and _timeout():
+                cache.set(_cache_key(user.pk), user, _timeout())
+
+        request._cached_user = user
+    return request._cached_user
+
+
+async def aget_cached_user(request):
+    if not hasattr(request, "_acached_user"):
+        user_id = await request.session.aget(SESSION_KEY)
+        user = None
+
+        if user_id is not None and _timeout():
+            user = await cache.aget(_cache_key(user_id))
+            if user is not None and not _verified(user, await request.session.aget(HASH_SESSION_KEY)):
+                user = None
+
+        if user is None:
+            user = await auth.aget_user(request)
+            if user.is_authenticated and _timeout():
+                await cache.aset(_cache_key(user.pk), user, _timeout())
+
+        request._acached_user = user
+    return request._acached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+        request.auser = partial(aget_cached_user, request)
+
+
+# =========================
+# INVALIDATION
+# =========================
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    cache.delete(_cache_key(instance.pk))
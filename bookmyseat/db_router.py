@@ -0,0 +1,144 @@
+"""
+Read-replica routing for bookmyseat.
+
+Views wrapped in ``read_replica`` send their reads to one of the databases
+listed in ``settings.DATABASE_REPLICAS``; everything else (and every write)
+stays on ``default``. A browser that has just changed replicated data is
+pinned to the primary for ``settings.REPLICA_PIN_SECONDS`` so it always reads
+its own writes, even while the replicas are catching up.
+
+Only real changes pin: model saves through ``post_save`` and bulk
+statements that report affected rows through ``mark_written``. Locking
+reads and UPDATEs / DELETEs that matched nothing don't.
+"""
+
+import contextvars
+import random
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils.decorators import sync_and_async_middleware
+
+PIN_COOKIE = "pin_primary"
+
+# Only catalog data may come from a replica; sessions and users are always
+# read from the primary so logins and profile edits are visible immediately.
+REPLICA_APP_LABELS = {"movies"}
+
+_use_replica = contextvars.ContextVar("use_replica", default=False)
+_request_state = contextvars.ContextVar("request_state", default=None)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if (
+            _use_replica.get()
+            and settings.DATABASE_REPLICAS
+            and model._meta.app_label in REPLICA_APP_LABELS
+        ):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+def _wants_replica(request):
+    return request.method in ("GET", "HEAD") and not request.COOKIES.get(PIN_COOKIE)
+
+
+def read_replica(view):
+    """Serve a read-only view from a replica unless the client is pinned."""
+
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if not _wants_replica(request):
+                return await view(request, *args, **kwargs)
+
+            token = _use_replica.set(True)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _use_replica.reset(token)
+
+        return wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not _wants_replica(request):
+            return view(request, *args, **kwargs)
+
+        token = _use_replica.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+
+    return wrapper
+
+
+def mark_written():
+    """Pin the current request's client to the primary (no-op outside a request)."""
+    state = _request_state.get()
+    if state is not None:
+        state["wrote"] = True
+
+
+@receiver(post_save)
+def _pin_on_save(sender, **kwargs):
+    if sender._meta.app_label in REPLICA_APP_LABELS:
+        mark_written()
+
+
+def _pin_if_written(state, response):
+    if state["wrote"]:
+        response.set_cookie(
+            PIN_COOKIE,
+            "1",
+            max_age=settings.REPLICA_PIN_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+@sync_and_async_middleware
+def primary_pinning_middleware(get_response):
+    """Pin the client to the primary for a short while after it changed data."""
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            state = {"wrote": False}
+            token = _request_state.set(state)
+            try:
+                response = await get_response(request)
+            finally:
+                _request_state.reset(token)
+            return _pin_if_written(state, response)
+
+        return middleware
+
+    def middleware(request):
+        state = {"wrote": False}
+        token = _request_state.set(state)
+        try:
+            response = get_response(request)
+        finally:
+            _request_state.reset(token)
+        return _pin_if_written(state, response)
+
+    return middleware
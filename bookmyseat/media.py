@@ -0,0 +1,132 @@
+"""
+Production serving of uploaded media (movie posters).
+
+``django.views.static.serve`` is only meant for development; this view adds
+what browsers and CDNs need to cache posters properly: a strong ETag,
+Last-Modified / 304 handling, single byte ranges and far-future immutable
+caching for content-hashed file names.
+"""
+
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+
+# e.g. "poster.3f2a9c1b7d4e.jpg" as written by movies.models.poster_upload_path
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^.]+$")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=3600"
+
+CHUNK_SIZE = 64 * 1024
+
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _etag(st):
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def _weak(tag):
+    return tag.strip().removeprefix("W/")
+
+
+def _not_modified(request, etag, mtime):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        # Weak comparison (RFC 9110 13.1.2): proxies and compressing CDNs
+        # hand our strong ETag back as W/"..."
+        return if_none_match.strip() == "*" or _weak(etag) in [
+            _weak(tag) for tag in if_none_match.split(",")
+        ]
+
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+    return if_modified_since is not None and int(mtime) <= if_modified_since
+
+
+def _byte_range(request, etag, size):
+    """(start, end) of a satisfiable single range, None for the whole file, or False."""
+    header = request.headers.get("Range")
+    if not header:
+        return None
+
+    # Only honour the range if the client's copy is still current
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range.strip() != etag:
+        return None
+
+    match = RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start = max(size - int(last), 0)
+        end = size - 1
+
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_media(request, path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        st = os.stat(full_path)
+    except (OSError, ValueError):
+        raise Http404("Media file not found")
+
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404("Media file not found")
+
+    etag = _etag(st)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(st.st_mtime),
+        "Cache-Control": IMMUTABLE if HASHED_NAME.search(path) else REVALIDATE,
+        "Accept-Ranges": "bytes",
+    }
+
+    if _not_modified(request, etag, st.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+        byte_range = _byte_range(request, etag, st.st_size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{st.st_size}"
+        elif byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _read_range(full_path, start, end - start + 1),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+            response["Content-Length"] = str(end - start + 1)
+        else:
+            response = FileResponse(open(full_path, "rb"), content_type=content_type)
+
+    for name, value in headers.items():
+        response[name] = value
+    return response
@@ -0,0 +1,111 @@
+"""
+Write-behind cached sessions (``SESSION_ENGINE = "bookmyseat.sessions"``).
+
+Reads come from the cache like Django's ``cached_db`` engine. Writes go to
+the cache every time but reach the ``django_session`` table only when the
+session is created and then at most once per
+``SESSION_WRITE_BEHIND_SECONDS``. If a cache entry is lost, up to that many
+seconds of session changes are lost with it; logins themselves are always
+written through, because they create a new session key.
+
+Needs a cache shared by every instance (Redis), otherwise instances would
+read each other's stale database copies.
+"""
+
+import logging
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.utils import timezone
+
+logger = logging.getLogger("django.contrib.sessions")
+
+# Expired session rows deleted per statement
+PURGE_BATCH = 5000
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = "bookmyseat.sessions"
+
+    def _flush_key(self):
+        return f"{self.cache_key}:flushed"
+
+    def _interval(self):
+        return getattr(settings, "SESSION_WRITE_BEHIND_SECONDS", 60)
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+
+        try:
+            # Only the first save in each interval gets to write the database
+            flush_due = self._cache.add(self._flush_key(), True, self._interval())
+            if not (must_create or flush_due):
+                self._cache.set(
+                    self.cache_key, self._get_session(no_load=must_create), self.get_expiry_age()
+                )
+                return
+        except Exception:
+            logger.exception("Error saving to cache (%s)", self._cache)
+
+        super().save(must_create)
+
+    async def asave(self, must_create=False):
+        if self.session_key is None:
+            return await self.acreate()
+
+        try:
+            flush_due = await self._cache.aadd(self._flush_key(), True, self._interval())
+            if not (must_create or flush_due):
+                await self._cache.aset(
+                    await self.acache_key(),
+                    await self._aget_session(no_load=must_create),
+                    await self.aget_expiry_age(),
+                )
+                return
+        except Exception:
+            logger.exception("Error saving to cache (%s)", self._cache)
+
+        await super().asave(must_create)
+
+    def delete(self, session_key=None):
+        super().delete(session_key)
+        session_key = session_key or self.session_key
+        if session_key:
+            self._cache.delete(f"{self.cache_key_prefix}{session_key}:flushed")
+
+    async def adelete(self, session_key=None):
+        await super().adelete(session_key)
+        session_key = session_key or self.session_key
+        if session_key:
+            await self._cache.adelete(f"{self.cache_key_prefix}{session_key}:flushed")
+
+    @classmethod
+    def clear_expired(cls):
+        # Used by `manage.py clearsessions`
+        purge_expired()
+
+
+# =========================
+# EXPIRED SESSION PURGE (manage.py purge_sessions)
+# =========================
+def purge_expired(batch_size=PURGE_BATCH, progress=None):
+    """Delete expired rows from the session table a batch at a time.
+
+    Works whatever the engine, as long as sessions are stored in the
+    database. Small batches keep each DELETE short instead of locking the
+    table for one huge statement. Returns the number of rows deleted.
+    """
+    Session = SessionStore.get_model_class()
+    deleted = 0
+    while True:
+        keys = list(
+            Session.objects.filter(expire_date__lt=timezone.now())
+            .values_list("session_key", flat=True)[:batch_size]
+        )
+        if not keys:
+            return deleted
+
+        deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+        if progress:
+            progress(deleted)
@@ -1,14 +1,23 @@
 from pathlib import Path
 import os
 import dj_database_url
-from dotenv import load_dotenv
 
 # ==================================================
 # BASE CONFIG
 # ==================================================
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-load_dotenv(BASE_DIR / ".env")
+
+# Deployed instances get their environment from the platform; skip the
+# python-dotenv import on cold start unless there is a .env file to read.
+if (BASE_DIR / ".env").exists():
+    from dotenv import load_dotenv
+
+    load_dotenv(BASE_DIR / ".env")
+
+# Vercel sets VERCEL=1. Its functions are short-lived and can only write
+# under /tmp (the code in /var/task is read-only).
+SERVERLESS = os.environ.get("VERCEL") == "1"
 
 # ==================================================
 # SECURITY
@@ -46,17 +55,22 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "bookmyseat.db_router.primary_pinning_middleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "bookmyseat.auth.CachedAuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
 ROOT_URLCONF = "bookmyseat.urls"
 WSGI_APPLICATION = "bookmyseat.wsgi.application"
+ASGI_APPLICATION = "bookmyseat.asgi.application"
+
+# Serve catalog / seat / profile pages with async views (set by asgi.py)
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "False") == "True"
 
 LOGIN_URL = "/login/"
 AUTH_USER_MODEL = "auth.User"
@@ -81,6 +95,12 @@ TEMPLATES = [
     },
 ]
 
+# Build the URL resolver and compile every template when a WSGI worker
+# starts (bookmyseat/warmup.py). Long-lived workers pay for that once, before
+# traffic; a serverless instance boots inside its first request, which would
+# pay for all of it, so it's off there by default.
+WARM_UP = os.environ.get("WARM_UP", str(not SERVERLESS)) == "True"
+
 # ==================================================
 # DATABASE
 # ==================================================
@@ -104,6 +124,100 @@ else:
         }
     }
 
+# Read replicas, e.g.
+#   DATABASE_REPLICA_URLS=postgres://replica-1/db,postgres://replica-2/db
+# For local testing two SQLite files work too (copy db.sqlite3 first):
+#   DATABASE_REPLICA_URLS=sqlite:///db.replica.sqlite3
+DATABASE_REPLICAS = []
+
+for index, replica_url in enumerate(
+    url.strip() for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+):
+    alias = f"replica_{index + 1}"
+    DATABASES[alias] = dj_database_url.parse(
+        replica_url,
+        conn_max_age=600,
+        ssl_require=not replica_url.startswith("sqlite"),
+    )
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["bookmyseat.db_router.ReplicaRouter"]
+
+# Seconds a client reads from the primary after it has written
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "10"))
+
+# ==================================================
+# CACHE
+# ==================================================
+
+# Admission control needs a cache shared by all instances in production
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# ==================================================
+# SESSIONS + AUTH CACHE (see bookmyseat/sessions.py and bookmyseat/auth.py)
+# ==================================================
+
+# Write-behind cached sessions need the shared Redis cache
+SESSION_ENGINE = os.environ.get(
+    "SESSION_ENGINE",
+    "bookmyseat.sessions" if REDIS_URL else "django.contrib.sessions.backends.db",
+)
+# How often a changed session is written back to the database
+SESSION_WRITE_BEHIND_SECONDS = int(os.environ.get("SESSION_WRITE_BEHIND_SECONDS", "60"))
+
+# How long the logged-in user is cached (0 = load it from the DB every request)
+AUTH_USER_CACHE_SECONDS = int(os.environ.get("AUTH_USER_CACHE_SECONDS", "300" if REDIS_URL else "0"))
+
+# ==================================================
+# ADMISSION CONTROL (Waiting room for hot showtimes)
+# ==================================================
+
+ADMISSION_CONTROL = {
+    "ENABLED": os.environ.get("ADMISSION_CONTROL", "True") == "True",
+    # Admissions per second per showtime, and how many may burst at once
+    "RATE": float(os.environ.get("ADMISSION_RATE", "5")),
+    "BURST": int(os.environ.get("ADMISSION_BURST", "20")),
+    # Seconds an admitted user may keep booking without queueing again
+    "PASS_TTL": 600,
+    # Per-user limit on booking requests
+    "USER_LIMIT": 30,
+    "USER_WINDOW": 60,
+}
+
+# ==================================================
+# FUNNEL TRACING (see movies/tracing.py)
+# ==================================================
+
+TRACING = {
+    "ENABLED": os.environ.get("TRACING", "False") == "True",
+    # Share of sessions traced through the whole booking funnel
+    "SAMPLE_RATE": float(os.environ.get("TRACE_SAMPLE_RATE", "0.1")),
+    # Must be writable: /tmp on serverless, where the project directory isn't
+    # (spans there are lost with the instance, so point TRACE_DIR at a
+    # mounted volume to keep them). Export errors are logged, never raised.
+    "DIR": os.environ.get(
+        "TRACE_DIR", "/tmp/traces" if SERVERLESS else str(BASE_DIR / "traces")
+    ),
+    # Rotate each process's span file at 10 MiB, keeping 5 old ones
+    "MAX_BYTES": 10 * 1024 * 1024,
+    "BACKUP_COUNT": 5,
+}
+
 # ==================================================
 # PASSWORD VALIDATION
 # ==================================================
@@ -136,8 +250,17 @@ STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
 
-# IMPORTANT: Required for admin static to work in production
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# IMPORTANT: Required for admin static to work in production.
+# Hashed names + gzip, and Brotli too when the Brotli package is installed.
+# (STATICFILES_STORAGE is ignored since Django 5.1, so use STORAGES.)
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
 # ==================================================
 # MEDIA FILES
@@ -146,6 +269,10 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Serve MEDIA_ROOT through bookmyseat.media.serve_media when DEBUG is off
+# (disable when a CDN / object storage serves uploads instead)
+SERVE_MEDIA = os.environ.get("SERVE_MEDIA", "True") == "True"
+
 # ==================================================
 # STRIPE CONFIG
 # ==================================================
@@ -0,0 +1,39 @@
+"""
+Start-up warm-up for long-lived WSGI workers.
+
+Django builds the URL resolver and compiles templates lazily, so on a fresh
+worker the first request pays for both. ``warm_up`` does that work while
+the worker is booting instead, before it receives traffic. Serverless
+instances boot inside their first request, so ``settings.WARM_UP`` is off
+there by default.
+"""
+
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+
+def template_names():
+    for directory in settings.TEMPLATES[0]["DIRS"]:
+        directory = Path(directory)
+        for path in sorted(directory.rglob("*.html")):
+            yield path.relative_to(directory).as_posix()
+
+
+def warm_up():
+    # Importing every view module and compiling the URL patterns
+    get_resolver().reverse_dict
+
+    # With the cached loader (the default when DEBUG is off) compiled
+    # templates stay in memory for the lifetime of the instance
+    compiled = 0
+    for name in template_names():
+        try:
+            get_template(name)
+        except (TemplateDoesNotExist, TemplateSyntaxError):
+            continue
+        compiled += 1
+    return compiled
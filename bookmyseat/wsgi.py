@@ -14,4 +14,12 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bookmyseat.settings')
 
 application = get_wsgi_application()
-app = application
\ No newline at end of file
+app = application
+
+# Do the lazy URLconf / template work now rather than on the first request
+from django.conf import settings
+
+if settings.WARM_UP:
+    from .warmup import warm_up
+
+    warm_up()
@@ -1,5 +1,16 @@
-from django.contrib import admin
-from .models import Movie, Theater, Seat, Booking
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.db import transaction
+from django.utils.dateparse import parse_date
+from .models import Movie, Venue, Screen, ScreenSeat, Theater, Seat, Booking
+from .availability import reconcile
+from .bulk import (
+    BulkOperationError,
+    clone_showtime,
+    move_bookings,
+    release_stale_holds,
+)
 
 
 # ==================================================
@@ -24,16 +35,111 @@ class MovieAdmin(admin.ModelAdmin):
     ]
 
 
+# ==================================================
+# VENUE / SCREEN ADMIN
+# ==================================================
+
+class ScreenInline(admin.TabularInline):
+    model = Screen
+    extra = 0
+
+
+@admin.register(Venue)
+class VenueAdmin(admin.ModelAdmin):
+    list_display = ['name', 'city']
+    search_fields = ['name', 'city']
+    inlines = [ScreenInline]
+
+
+class ScreenSeatInline(admin.TabularInline):
+    model = ScreenSeat
+    extra = 0
+
+
+@admin.register(Screen)
+class ScreenAdmin(admin.ModelAdmin):
+    list_display = ['name', 'venue']
+    search_fields = ['name', 'venue__name']
+    list_filter = ['venue']
+    inlines = [ScreenSeatInline]
+
+    # Seats and layouts edited in the admin bypass the helpers that keep the
+    # free / held / sold counters up to date, so their showtimes are recounted
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        reconcile(Theater.objects.filter(screen=form.instance))
+
+
 # ==================================================
 # THEATER ADMIN
 # ==================================================
 
+class ShowtimeActionForm(ActionForm):
+    target_date = forms.DateField(
+        required=False,
+        label='Clone to date',
+        widget=forms.DateInput(attrs={'type': 'date'}),
+    )
+    target_showtime = forms.IntegerField(
+        required=False,
+        label='Move to showtime ID',
+    )
+
+
 @admin.register(Theater)
 class TheaterAdmin(admin.ModelAdmin):
-    list_display = ['name', 'movie', 'time']
+    list_display = ['name', 'movie', 'screen', 'time', 'seats_free', 'seats_held', 'seats_sold']
     search_fields = ['name', 'movie__name']
-    list_filter = ['movie']
+    list_filter = ['movie', 'screen__venue']
     ordering = ['-time']
+    readonly_fields = ['seats_free', 'seats_held', 'seats_sold']
+    action_form = ShowtimeActionForm
+    actions = ['clone_to_date', 'release_holds', 'move_bookings_to_showtime']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and 'screen' in form.changed_data:
+            reconcile(Theater.objects.filter(id=obj.id))
+
+    @admin.action(description='Clone selected showtimes (with seats) to date')
+    def clone_to_date(self, request, queryset):
+        target_date = parse_date(request.POST.get('target_date') or '')
+        if not target_date:
+            self.message_user(request, 'Pick a date to clone to.', messages.ERROR)
+            return
+
+        clones = []
+        for theater in queryset:
+            clones += clone_showtime(theater, [target_date])
+
+        self.message_user(
+            request,
+            f'Created {len(clones)} showtime(s) on {target_date}.',
+            messages.SUCCESS,
+        )
+
+    @admin.action(description='Release stale seat holds')
+    def release_holds(self, request, queryset):
+        released = release_stale_holds(Seat.objects.filter(theater__in=queryset))
+        self.message_user(request, f'Released {released} stale hold(s).', messages.SUCCESS)
+
+    @admin.action(description='Move bookings to showtime ID')
+    def move_bookings_to_showtime(self, request, queryset):
+        target = Theater.objects.filter(id=request.POST.get('target_showtime') or None).first()
+        if target is None:
+            self.message_user(request, 'Enter a valid target showtime ID.', messages.ERROR)
+            return
+
+        moved = 0
+        try:
+            with transaction.atomic():
+                for theater in queryset:
+                    moved += move_bookings(theater, target)
+        except BulkOperationError as exc:
+            self.message_user(request, str(exc), messages.ERROR)
+            return
+
+        self.message_user(request, f'Moved {moved} booking(s) to {target}.', messages.SUCCESS)
 
 
 # ==================================================
@@ -54,6 +160,27 @@ class SeatAdmin(admin.ModelAdmin):
     search_fields = ['seat_number', 'theater__name']
     ordering = ['theater', 'seat_number']
     readonly_fields = ['reserved_at']
+    actions = ['release_holds']
+
+    def save_model(self, request, obj, form, change):
+        previous = form.initial.get('theater')
+        super().save_model(request, obj, form, change)
+        reconcile(Theater.objects.filter(id__in=[obj.theater_id, previous]))
+
+    def delete_model(self, request, obj):
+        theater_id = obj.theater_id
+        super().delete_model(request, obj)
+        reconcile(Theater.objects.filter(id=theater_id))
+
+    def delete_queryset(self, request, queryset):
+        theater_ids = set(queryset.values_list('theater_id', flat=True))
+        super().delete_queryset(request, queryset)
+        reconcile(Theater.objects.filter(id__in=theater_ids))
+
+    @admin.action(description='Release stale holds among selected seats')
+    def release_holds(self, request, queryset):
+        released = release_stale_holds(queryset)
+        self.message_user(request, f'Released {released} stale hold(s).', messages.SUCCESS)
 
 
 # ==================================================
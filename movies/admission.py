@@ -0,0 +1,174 @@
+"""
+Admission control ("virtual waiting room") for hot showtimes.
+
+Every showtime has a token bucket that refills at ``RATE`` admissions per
+second, up to ``BURST``. Users without an admission pass take a ticket from
+a FIFO queue; tokens move the head of the queue forward, and everybody whose
+ticket is at or behind the head is admitted for ``PASS_TTL`` seconds.
+Admitted users are additionally limited to ``USER_LIMIT`` requests per
+``USER_WINDOW`` seconds.
+
+All state lives in the Django cache, so the local-memory backend works for
+development and tests; production needs a shared cache (see CACHES).
+"""
+
+import math
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+DEFAULTS = {
+    "ENABLED": True,
+    "RATE": 5.0,
+    "BURST": 20,
+    "PASS_TTL": 600,
+    "USER_LIMIT": 30,
+    "USER_WINDOW": 60,
+    "REFRESH_SECONDS": 5,
+}
+
+# Lifetime of queue bookkeeping for a showtime nobody is asking about
+STATE_TTL = 60 * 60
+
+# Per-showtime queue state; always refreshed together so it expires as one
+QUEUE_STATE = ("head", "tail", "bucket")
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, "ADMISSION_CONTROL", {})}
+
+
+def _key(theater_id, name, user_id=None):
+    if user_id is None:
+        return f"admission:{theater_id}:{name}"
+    return f"admission:{theater_id}:{name}:{user_id}"
+
+
+def _touch_queue(theater_id):
+    for name in QUEUE_STATE:
+        cache.touch(_key(theater_id, name), STATE_TTL)
+
+
+def _advance_queue(theater_id, config):
+    """Convert accrued tokens into admissions at the head of the queue."""
+    lock = _key(theater_id, "lock")
+    if not cache.add(lock, 1, timeout=5):
+        # Another request is advancing the queue right now
+        return
+
+    try:
+        now = time.time()
+        tokens, refilled_at = cache.get(
+            _key(theater_id, "bucket"), (float(config["BURST"]), now)
+        )
+        tokens = min(float(config["BURST"]), tokens + (now - refilled_at) * config["RATE"])
+
+        head = cache.get(_key(theater_id, "head"), 0)
+        tail = cache.get(_key(theater_id, "tail"), 0)
+        granted = min(int(tokens), tail - head)
+
+        if granted > 0:
+            cache.set(_key(theater_id, "head"), head + granted, STATE_TTL)
+            tokens -= granted
+
+        cache.set(_key(theater_id, "bucket"), (tokens, now), STATE_TTL)
+        _touch_queue(theater_id)
+    finally:
+        cache.delete(lock)
+
+
+def _take_ticket(theater_id, user_id):
+    ticket_key = _key(theater_id, "ticket", user_id)
+    ticket = cache.get(ticket_key)
+    if ticket is None:
+        tail_key = _key(theater_id, "tail")
+        # A new tail starts at the head, never behind it: tickets at or
+        # behind the head would be admitted without waiting for a token
+        cache.add(tail_key, cache.get(_key(theater_id, "head"), 0), STATE_TTL)
+        ticket = cache.incr(tail_key)
+        cache.set(ticket_key, ticket, STATE_TTL)
+        _touch_queue(theater_id)
+    return ticket
+
+
+def _over_user_limit(user_id, config):
+    window = int(time.time() // config["USER_WINDOW"])
+    key = f"admission:rate:{user_id}:{window}"
+    cache.add(key, 0, config["USER_WINDOW"])
+    return cache.incr(key) > config["USER_LIMIT"]
+
+
+def queue_position(theater_id, user):
+    """0 when ``user`` may proceed, otherwise their place in the queue."""
+    config = _config()
+    pass_key = _key(theater_id, "pass", user.id)
+
+    if cache.get(pass_key):
+        return 0
+
+    ticket = _take_ticket(theater_id, user.id)
+    _advance_queue(theater_id, config)
+
+    head = cache.get(_key(theater_id, "head"), 0)
+    if ticket <= head:
+        cache.set(pass_key, 1, config["PASS_TTL"])
+        cache.delete(_key(theater_id, "ticket", user.id))
+        return 0
+
+    return ticket - head
+
+
+def _admit(request, user, theater_id, config):
+    """None if the request may proceed, otherwise the response to send instead."""
+    position = queue_position(theater_id, user)
+    if position:
+        response = render(request, "movies/waiting_room.html", {
+            "position": position,
+            "wait_seconds": math.ceil(position / config["RATE"]),
+            "refresh_seconds": config["REFRESH_SECONDS"],
+        }, status=503)
+        response["Retry-After"] = str(config["REFRESH_SECONDS"])
+        return response
+
+    if _over_user_limit(user.id, config):
+        response = render(request, "movies/waiting_room.html", {
+            "rate_limited": True,
+            "refresh_seconds": config["USER_WINDOW"],
+        }, status=429)
+        response["Retry-After"] = str(config["USER_WINDOW"])
+        return response
+
+    return None
+
+
+def admission_control(view):
+    """Queue users of a ``theater_id`` view instead of letting them all hit the DB."""
+
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            config = _config()
+            if config["ENABLED"]:
+                user = await request.auser()
+                rejected = await sync_to_async(_admit)(request, user, kwargs["theater_id"], config)
+                if rejected:
+                    return rejected
+            return await view(request, *args, **kwargs)
+
+        return wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        config = _config()
+        if config["ENABLED"]:
+            rejected = _admit(request, request.user, kwargs["theater_id"], config)
+            if rejected:
+                return rejected
+        return view(request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,157 @@
+"""
+Hot/cold archival of past showtimes.
+
+``archive_showtimes`` moves the booked seats and bookings of showtimes older
+than a cutoff into ``ArchivedSeat`` / ``ArchivedBooking`` and drops their
+other (free or long-expired held) seat rows, a batch of showtimes per
+transaction. The showtime itself stays, flagged ``archived``, so its
+counters and foreign keys keep working.
+
+Profile history and the dashboard read both tables through the helpers
+below, so archived bookings still show up there.
+"""
+
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+
+from .models import Theater, Seat, Booking, ArchivedSeat, ArchivedBooking
+
+# Showtimes archived per transaction
+ARCHIVE_BATCH = 200
+
+# Rows per INSERT into the archive tables
+INSERT_BATCH = 500
+
+
+# =========================
+# ARCHIVING
+# =========================
+def archivable_showtimes(cutoff):
+    return Theater.objects.filter(time__lt=cutoff, archived=False)
+
+
+def _archive_batch(theater_ids):
+    with transaction.atomic():
+        theater_ids = list(
+            Theater.objects.select_for_update()
+            .filter(id__in=theater_ids, archived=False)
+            .values_list("id", flat=True)
+        )
+
+        seats = Seat.objects.filter(theater_id__in=theater_ids)
+        bookings = list(Booking.objects.filter(seat__theater_id__in=theater_ids))
+        kept = seats.filter(Q(is_booked=True) | Q(booking__isnull=False))
+
+        ArchivedSeat.objects.bulk_create(
+            [
+                ArchivedSeat(
+                    id=seat.id,
+                    theater_id=seat.theater_id,
+                    seat_number=seat.seat_number,
+                    is_booked=seat.is_booked,
+                )
+                for seat in kept
+            ],
+            batch_size=INSERT_BATCH,
+        )
+        ArchivedBooking.objects.bulk_create(
+            [
+                ArchivedBooking(
+                    id=booking.id,
+                    user_id=booking.user_id,
+                    seat_id=booking.seat_id,
+                    movie_id=booking.movie_id,
+                    theater_id=booking.theater_id,
+                    is_paid=booking.is_paid,
+                    payment_id=booking.payment_id,
+                    amount_paid=booking.amount_paid,
+                    booked_at=booking.booked_at,
+                )
+                for booking in bookings
+            ],
+            batch_size=INSERT_BATCH,
+        )
+
+        Booking.objects.filter(seat__theater_id__in=theater_ids).delete()
+        _, deleted = seats.delete()
+        Theater.objects.filter(id__in=theater_ids).update(archived=True)
+
+    return len(theater_ids), deleted.get(Seat._meta.label, 0), len(bookings)
+
+
+def archive_showtimes(cutoff, batch_size=ARCHIVE_BATCH, progress=None):
+    """Archive every showtime before ``cutoff``.
+
+    Returns (showtimes, seat rows removed, bookings moved).
+    """
+    ids = list(archivable_showtimes(cutoff).order_by("id").values_list("id", flat=True))
+    showtimes = seats = bookings = 0
+
+    for start in range(0, len(ids), batch_size):
+        done = _archive_batch(ids[start:start + batch_size])
+        showtimes += done[0]
+        seats += done[1]
+        bookings += done[2]
+
+        if progress:
+            progress(min(start + batch_size, len(ids)), len(ids))
+
+    return showtimes, seats, bookings
+
+
+def hot_table_sizes():
+    """{table: (rows, bytes or None)} for the Seat and Booking tables."""
+    sizes = {}
+    for model in (Seat, Booking):
+        table = model._meta.db_table
+        size = None
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_total_relation_size(%s)", [table])
+                size = cursor.fetchone()[0]
+        sizes[table] = (model.objects.count(), size)
+    return sizes
+
+
+# =========================
+# READS ACROSS HOT + ARCHIVE
+# =========================
+def _hot_and_archived(user):
+    return (
+        Booking.objects.filter(user=user).select_related("movie", "theater", "seat"),
+        ArchivedBooking.objects.filter(user=user).select_related("movie", "theater", "seat"),
+    )
+
+
+def user_bookings(user):
+    """Every booking of ``user``, archived ones first."""
+    hot, archived = _hot_and_archived(user)
+    return list(archived.order_by("id")) + list(hot.order_by("id"))
+
+
+async def auser_bookings(user):
+    hot, archived = _hot_and_archived(user)
+    return (
+        [booking async for booking in archived.order_by("id").aiterator()]
+        + [booking async for booking in hot.order_by("id").aiterator()]
+    )
+
+
+def paid_revenue():
+    return sum(
+        model.objects.filter(is_paid=True).aggregate(total=Sum("amount_paid"))["total"] or 0
+        for model in (Booking, ArchivedBooking)
+    )
+
+
+def paid_bookings_by(field, limit=5):
+    """[{field: value, "total": paid bookings}] for the ``limit`` biggest values."""
+    totals = Counter()
+    for model in (Booking, ArchivedBooking):
+        rows = model.objects.filter(is_paid=True).values_list(field).annotate(total=Count("id"))
+        for value, total in rows:
+            totals[value] += total
+
+    return [{field: value, "total": total} for value, total in totals.most_common(limit)]
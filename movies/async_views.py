@@ -0,0 +1,109 @@
+"""
+Async versions of the catalog, seat and payment views, used when the site
+runs under ASGI (see ``settings.ASYNC_VIEWS``). Reads use the async ORM so a
+request no longer ties up a thread of the sync pool; writes reuse the sync
+code paths through ``sync_to_async``.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import aget_object_or_404, redirect, render
+
+from bookmyseat.db_router import read_replica
+from .admission import admission_control
+from .bulk import release_stale_holds
+from .models import Movie, Theater, Seat
+from .payments import fulfil_checkout, get_stripe
+from .recommendations import aalso_booked
+from .seating import aseat_map
+from .tracing import external, traced
+from .showtimes import apaginate, group_by_date_and_venue, upcoming_showtimes
+from .views import filter_movies, reserve_selected_seats
+
+
+# =========================
+# MOVIE LIST + FILTERS
+# =========================
+@read_replica
+async def movie_list(request):
+    request.user = await request.auser()
+    movies = [movie async for movie in filter_movies(request).aiterator()]
+
+    return render(request, "movies/movie_list.html", {
+        "movies": movies,
+        "genre_choices": Movie.GENRE_CHOICES,
+        "language_choices": Movie.LANGUAGE_CHOICES,
+    })
+
+
+# =========================
+# THEATER LIST
+# =========================
+@read_replica
+async def theater_list(request, movie_id):
+    request.user = await request.auser()
+    movie = await aget_object_or_404(Movie, id=movie_id)
+    page = await apaginate(
+        upcoming_showtimes(Theater.objects.filter(movie=movie)),
+        request.GET.get("page"),
+    )
+
+    return render(request, "movies/theater_list.html", {
+        "movie": movie,
+        "theaters": page.object_list,
+        "showtime_groups": group_by_date_and_venue(page.object_list),
+        "page_obj": page,
+        "also_booked": await aalso_booked(movie)
+    })
+
+
+# =========================
+# SEAT RESERVATION
+# =========================
+@login_required(login_url="/login/")
+@traced("seat_page", post="reserve")
+@admission_control
+async def book_seats(request, theater_id):
+    request.user = await request.auser()
+    theater = await aget_object_or_404(
+        Theater.objects.select_related("movie"), id=theater_id, archived=False
+    )
+
+    # Auto-release expired reservations
+    await sync_to_async(release_stale_holds)(Seat.objects.filter(theater=theater))
+
+    if request.method == "POST":
+        return await sync_to_async(reserve_selected_seats)(request, theater)
+
+    seats = await aseat_map(theater)
+    can_pay = any(
+        seat.is_reserved and seat.reserved_by_id == request.user.id
+        for seat in seats
+    )
+
+    return render(request, "movies/seat_selection.html", {
+        "theaters": theater,
+        "seats": seats,
+        "can_pay": can_pay
+    })
+
+
+# =========================
+# PAYMENT SUCCESS
+# =========================
+@login_required
+@traced("payment_success")
+async def payment_success(request):
+    request.user = await request.auser()
+    session_id = request.GET.get("session_id")
+
+    if not session_id:
+        return redirect("movie_list")
+
+    with external("stripe"):
+        session = await get_stripe().checkout.Session.retrieve_async(session_id)
+
+    if session.payment_status == "paid":
+        await sync_to_async(fulfil_checkout)(request.user, session.payment_intent)
+
+    return render(request, "movies/payment_success.html")
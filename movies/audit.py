@@ -0,0 +1,172 @@
+"""
+Consistency audit for seats and bookings.
+
+Each check is a set-based query over one primary-key range of ``Seat`` or
+``Booking``. Ranges are small, so no check holds a lock or a long-running
+snapshot. They can be spread over a process pool for large databases.
+``repair`` fixes what was found with batched statements and then
+recomputes the availability counters of the showtimes it touched.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.db import connections, transaction
+from django.db.models import F, Max, Min, OuterRef, Subquery
+
+from .availability import reconcile
+from .bulk import _chunks
+from .models import Theater, Seat, Booking
+
+# Primary keys covered by one check query
+AUDIT_CHUNK = 10000
+
+
+# =========================
+# CHECKS
+# =========================
+def _booked_without_booking(lo, hi):
+    return Seat.objects.filter(id__gte=lo, id__lt=hi, is_booked=True, booking__isnull=True)
+
+
+def _reserved_without_user(lo, hi):
+    return Seat.objects.filter(
+        id__gte=lo, id__lt=hi, is_reserved=True, is_booked=False, reserved_by__isnull=True
+    )
+
+
+def _booking_on_unbooked_seat(lo, hi):
+    return Booking.objects.filter(id__gte=lo, id__lt=hi, seat__is_booked=False)
+
+
+def _booking_showtime_mismatch(lo, hi):
+    # Booking.movie / .theater must be those of the seat's showtime
+    return Booking.objects.filter(id__gte=lo, id__lt=hi).exclude(
+        theater=F("seat__theater"), movie=F("seat__theater__movie")
+    )
+
+
+# name: (model whose ids are scanned, query for one id range)
+CHECKS = {
+    "booked_without_booking": (Seat, _booked_without_booking),
+    "reserved_without_user": (Seat, _reserved_without_user),
+    "booking_on_unbooked_seat": (Booking, _booking_on_unbooked_seat),
+    "booking_showtime_mismatch": (Booking, _booking_showtime_mismatch),
+}
+
+
+def pk_ranges(model, size=AUDIT_CHUNK):
+    bounds = model.objects.aggregate(lo=Min("id"), hi=Max("id"))
+    if bounds["lo"] is None:
+        return []
+    return [
+        (lo, min(lo + size, bounds["hi"] + 1))
+        for lo in range(bounds["lo"], bounds["hi"] + 1, size)
+    ]
+
+
+def _run_check(task):
+    name, lo, hi = task
+    return name, list(CHECKS[name][1](lo, hi).values_list("id", flat=True))
+
+
+def audit(checks=None, chunk_size=AUDIT_CHUNK, workers=1, progress=None):
+    """{check: sorted offending ids} for every check in ``checks`` (default: all)."""
+    checks = list(CHECKS) if checks is None else checks
+    ranges = {}
+    tasks = []
+    for name in checks:
+        model = CHECKS[name][0]
+        if model not in ranges:
+            ranges[model] = pk_ranges(model, chunk_size)
+        tasks += [(name, lo, hi) for lo, hi in ranges[model]]
+
+    found = {name: [] for name in checks}
+
+    if workers > 1 and len(tasks) > 1:
+        # Forked children inherit the loaded app registry but must open
+        # their own database connections
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+        ) as pool:
+            futures = [pool.submit(_run_check, task) for task in tasks]
+            for done, future in enumerate(as_completed(futures), start=1):
+                name, ids = future.result()
+                found[name] += ids
+                if progress:
+                    progress(done, len(tasks))
+    else:
+        for done, task in enumerate(tasks, start=1):
+            name, ids = _run_check(task)
+            found[name] += ids
+            if progress:
+                progress(done, len(tasks))
+
+    return {name: sorted(ids) for name, ids in found.items()}
+
+
+# =========================
+# REPAIR
+# =========================
+def _free(seats):
+    """Turn ``seats`` back into free seats. Returns their showtime ids."""
+    theater_ids = set(seats.values_list("theater_id", flat=True))
+    # Screen-backed showtimes don't store free seats
+    seats.filter(theater__screen__isnull=False).delete()
+    seats.update(is_booked=False, is_reserved=False, reserved_at=None, reserved_by=None)
+    return theater_ids
+
+
+def repair(found):
+    """Fix everything ``audit`` found. Returns {check: rows fixed}."""
+    fixed = {}
+    affected = set()
+
+    for name, ids in found.items():
+        fixed[name] = 0
+        for chunk in _chunks(ids):
+            with transaction.atomic():
+                # Re-check each condition, the rows may have changed since the audit
+                if name == "booked_without_booking":
+                    seats = Seat.objects.filter(id__in=chunk, is_booked=True, booking__isnull=True)
+                    locked = list(seats.select_for_update(of=("self",)).values_list("id", flat=True))
+                    affected |= _free(Seat.objects.filter(id__in=locked))
+
+                elif name == "reserved_without_user":
+                    seats = Seat.objects.filter(
+                        id__in=chunk, is_reserved=True, is_booked=False, reserved_by__isnull=True
+                    )
+                    locked = list(seats.select_for_update().values_list("id", flat=True))
+                    affected |= _free(Seat.objects.filter(id__in=locked))
+
+                elif name == "booking_on_unbooked_seat":
+                    seats = Seat.objects.filter(booking__id__in=chunk, is_booked=False)
+                    locked = list(seats.select_for_update(of=("self",)).values_list("id", flat=True))
+                    affected |= set(
+                        Seat.objects.filter(id__in=locked).values_list("theater_id", flat=True)
+                    )
+                    Seat.objects.filter(id__in=locked).update(
+                        is_booked=True, is_reserved=False, reserved_at=None, reserved_by=None
+                    )
+
+                elif name == "booking_showtime_mismatch":
+                    seat = Seat.objects.filter(id=OuterRef("seat_id"))
+                    locked = list(
+                        Booking.objects.filter(id__in=chunk)
+                        .exclude(theater=F("seat__theater"), movie=F("seat__theater__movie"))
+                        .select_for_update(of=("self",))
+                        .values_list("id", flat=True)
+                    )
+                    Booking.objects.filter(id__in=locked).update(
+                        theater=Subquery(seat.values("theater_id")[:1]),
+                        movie=Subquery(seat.values("theater__movie_id")[:1]),
+                    )
+
+                fixed[name] += len(locked)
+
+    if affected:
+        reconcile(Theater.objects.filter(id__in=affected))
+
+    return fixed
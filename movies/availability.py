@@ -0,0 +1,90 @@
+from collections import Counter
+
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from bookmyseat.db_router import mark_written
+
+from .models import Theater, ScreenSeat
+
+# Showtimes checked per reconciliation query
+RECONCILE_BATCH = 1000
+
+
+# =========================
+# INCREMENTAL UPDATES
+# =========================
+def adjust(theater_id, free=0, held=0, sold=0):
+    """Atomically shift a showtime's availability counters."""
+    changes = {}
+    if free:
+        changes["seats_free"] = F("seats_free") + free
+    if held:
+        changes["seats_held"] = F("seats_held") + held
+    if sold:
+        changes["seats_sold"] = F("seats_sold") + sold
+    if changes and Theater.objects.filter(id=theater_id).update(**changes):
+        mark_written()
+
+
+def adjust_many(theater_ids, free=0, held=0, sold=0):
+    """``adjust`` once per showtime, scaled by how often it appears in ``theater_ids``."""
+    for theater_id, count in Counter(theater_ids).items():
+        adjust(theater_id, free=free * count, held=held * count, sold=sold * count)
+
+
+# =========================
+# RECONCILIATION
+# =========================
+def actual_availability(theaters):
+    layout_size = (
+        ScreenSeat.objects.filter(screen=OuterRef("screen"))
+        .values("screen")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return theaters.annotate(
+        actual_sold=Count("seats", filter=Q(seats__is_booked=True)),
+        actual_held=Count("seats", filter=Q(seats__is_reserved=True, seats__is_booked=False)),
+        stored_rows=Count("seats"),
+        layout_size=Coalesce(Subquery(layout_size), 0),
+    )
+
+
+def reconcile(theaters=None, dry_run=False, progress=None):
+    """Recompute the counters from Seat rows.
+
+    Returns ``(theater, (free, held, sold) stored, (free, held, sold) actual)``
+    for every showtime that had drifted.
+    """
+    theaters = Theater.objects.all() if theaters is None else theaters
+    # Archived showtimes no longer have their free / held seat rows
+    theaters = theaters.filter(archived=False)
+    ids = list(theaters.order_by("id").values_list("id", flat=True))
+    drifted = []
+
+    for start in range(0, len(ids), RECONCILE_BATCH):
+        chunk = ids[start:start + RECONCILE_BATCH]
+        fixed = []
+
+        for theater in actual_availability(Theater.objects.filter(id__in=chunk)):
+            total = theater.layout_size if theater.screen_id else theater.stored_rows
+            free = total - theater.actual_sold - theater.actual_held
+
+            stored = (theater.seats_free, theater.seats_held, theater.seats_sold)
+            actual = (free, theater.actual_held, theater.actual_sold)
+
+            if stored != actual:
+                drifted.append((theater, stored, actual))
+                theater.seats_free = free
+                theater.seats_held = theater.actual_held
+                theater.seats_sold = theater.actual_sold
+                fixed.append(theater)
+
+        if fixed and not dry_run:
+            Theater.objects.bulk_update(fixed, ["seats_free", "seats_held", "seats_sold"])
+
+        if progress:
+            progress(min(start + RECONCILE_BATCH, len(ids)), len(ids))
+
+    return drifted
@@ -0,0 +1,205 @@
+from datetime import datetime
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Theater, Seat, ScreenSeat, Booking, RESERVATION_TIMEOUT
+from .availability import adjust, adjust_many
+
+# Rows touched per UPDATE / bulk_update statement
+BATCH_SIZE = 500
+
+
+class BulkOperationError(Exception):
+    pass
+
+
+def _chunks(items, size=BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _report(progress, done, total):
+    if progress:
+        progress(done, total)
+
+
+# =========================
+# CLONE SHOWTIME
+# =========================
+def clone_showtime(theater, dates, progress=None):
+    """Copy a showtime and its (empty) seat grid onto each of ``dates``.
+
+    Screen-backed showtimes share their screen's layout, so only the
+    showtime row is copied. Legacy showtimes get their seat grid copied with
+    a single INSERT ... SELECT, so no Seat instances are loaded into Python.
+    """
+    local_time = timezone.localtime(theater.time)
+    seat_table = Seat._meta.db_table
+    clones = []
+
+    with transaction.atomic():
+        for done, day in enumerate(dates, start=1):
+            clone = Theater.objects.create(
+                name=theater.name,
+                movie_id=theater.movie_id,
+                screen_id=theater.screen_id,
+                time=timezone.make_aware(
+                    datetime.combine(day, local_time.time().replace(tzinfo=None))
+                ),
+            )
+
+            if not theater.screen_id:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"INSERT INTO {seat_table} (theater_id, seat_number, is_booked, is_reserved) "
+                        f"SELECT %s, seat_number, %s, %s FROM {seat_table} WHERE theater_id = %s",
+                        [clone.id, False, False, theater.id],
+                    )
+                    adjust(clone.id, free=cursor.rowcount)
+
+            clones.append(clone)
+            _report(progress, done, len(dates))
+
+    return clones
+
+
+# =========================
+# RELEASE STALE HOLDS
+# =========================
+def stale_holds(seats):
+    cutoff = timezone.now() - RESERVATION_TIMEOUT
+    return seats.filter(is_reserved=True, is_booked=False).filter(
+        Q(reserved_at__lt=cutoff) | Q(reserved_at__isnull=True)
+    )
+
+
+def release_stale_holds(seats, progress=None):
+    """Release every expired hold in ``seats`` with batched statements.
+
+    Rows of screen-backed showtimes only exist while a seat is held or sold,
+    so their stale holds are deleted instead of reset.
+    """
+    # Nearly every seat page finds nothing to release; don't lock for that
+    if not stale_holds(seats).exists():
+        return 0
+
+    with transaction.atomic():
+        holds = list(
+            # Lock the seat rows only, not the showtimes joined in for screen_id
+            stale_holds(seats).select_for_update(of=("self",))
+            .values_list("id", "theater__screen_id", "theater_id")
+        )
+        released = 0
+
+        for chunk in _chunks(holds):
+            sparse_ids = [seat_id for seat_id, screen_id, _ in chunk if screen_id]
+            dense_ids = [seat_id for seat_id, screen_id, _ in chunk if not screen_id]
+
+            released += Seat.objects.filter(
+                id__in=sparse_ids, is_reserved=True, is_booked=False
+            ).delete()[0]
+            released += Seat.objects.filter(id__in=dense_ids, is_reserved=True).update(
+                is_reserved=False,
+                reserved_at=None,
+                reserved_by=None,
+            )
+            adjust_many([theater_id for _, _, theater_id in chunk], free=1, held=-1)
+            _report(progress, released, len(holds))
+
+    return released
+
+
+# =========================
+# MOVE BOOKINGS
+# =========================
+def move_bookings(source, target, progress=None):
+    """Move every booking of ``source`` onto the same seat numbers of ``target``.
+
+    All-or-nothing: if any seat is missing or already taken on the target
+    showtime, nothing is moved and BulkOperationError is raised.
+    """
+    if source.id == target.id:
+        raise BulkOperationError("Source and target showtime are the same.")
+
+    with transaction.atomic():
+        bookings = list(
+            Booking.objects.select_for_update(of=("self",))
+            .filter(theater=source)
+            .values_list("id", "seat_id", "seat__seat_number")
+        )
+        if not bookings:
+            return 0
+
+        numbers = [number for _, _, number in bookings]
+        # Only lock the seat rows: PostgreSQL refuses FOR UPDATE on the
+        # nullable side of the booking__isnull outer join below
+        target_seats = Seat.objects.select_for_update(of=("self",)).filter(
+            theater=target, seat_number__in=numbers
+        )
+        taken = set(
+            target_seats.filter(
+                Q(is_booked=True) | Q(is_reserved=True) | Q(booking__isnull=False)
+            ).values_list("seat_number", flat=True)
+        )
+
+        if target.screen_id:
+            valid = set(
+                ScreenSeat.objects.filter(
+                    screen_id=target.screen_id, seat_number__in=numbers
+                ).values_list("seat_number", flat=True)
+            )
+        else:
+            valid = set(target_seats.values_list("seat_number", flat=True))
+
+        missing = sorted(number for number in numbers if number not in valid or number in taken)
+        if missing:
+            raise BulkOperationError(
+                f"Seats unavailable on {target}: {', '.join(missing)}"
+            )
+
+        # Screen-backed targets have no rows for free seats yet
+        existing = set(target_seats.values_list("seat_number", flat=True))
+        Seat.objects.bulk_create(
+            [Seat(theater=target, seat_number=number) for number in numbers if number not in existing],
+            batch_size=BATCH_SIZE,
+        )
+        new_seats = dict(target_seats.values_list("seat_number", "id"))
+
+        moved = []
+        for booking_id, _, number in bookings:
+            moved.append(Booking(
+                id=booking_id,
+                seat_id=new_seats[number],
+                theater_id=target.id,
+                movie_id=target.movie_id,
+            ))
+
+        done = 0
+        for chunk in _chunks(moved):
+            Booking.objects.bulk_update(chunk, ["seat", "theater", "movie"])
+            done += len(chunk)
+            _report(progress, done, len(moved))
+
+        old_seat_ids = [seat_id for _, seat_id, _ in bookings]
+        new_seat_ids = [booking.seat_id for booking in moved]
+
+        for chunk in _chunks(new_seat_ids):
+            Seat.objects.filter(id__in=chunk).update(
+                is_booked=True,
+                is_reserved=False,
+                reserved_at=None,
+                reserved_by=None,
+            )
+
+        for chunk in _chunks(old_seat_ids):
+            if source.screen_id:
+                Seat.objects.filter(id__in=chunk).delete()
+            else:
+                Seat.objects.filter(id__in=chunk).update(is_booked=False)
+
+        adjust(source.id, free=len(moved), sold=-len(moved))
+        adjust(target.id, free=-len(moved), sold=len(moved))
+
+    return len(moved)
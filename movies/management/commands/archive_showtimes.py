@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from movies.archive import ARCHIVE_BATCH, archivable_showtimes, archive_showtimes, hot_table_sizes
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the seats and bookings of past showtimes out of the hot Seat / "
+        "Booking tables into the archive tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=30,
+            metavar="DAYS",
+            help="Archive showtimes that ended more than DAYS days ago (default: 30)",
+        )
+        parser.add_argument(
+            "--before",
+            metavar="YYYY-MM-DD",
+            help="Archive showtimes before this date instead",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARCHIVE_BATCH,
+            help=f"Showtimes archived per transaction (default: {ARCHIVE_BATCH})",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the showtimes that would be archived",
+        )
+
+    def handle(self, *args, **options):
+        if options["before"]:
+            try:
+                day = datetime.strptime(options["before"], "%Y-%m-%d")
+            except ValueError:
+                raise CommandError("--before must be a date like 2024-01-31.")
+            cutoff = timezone.make_aware(day)
+        else:
+            cutoff = timezone.now() - timedelta(days=options["older_than"])
+
+        if options["dry_run"]:
+            count = archivable_showtimes(cutoff).count()
+            self.stdout.write(f"{count} showtime(s) before {cutoff:%Y-%m-%d %H:%M} would be archived.")
+            return
+
+        before = hot_table_sizes()
+
+        def progress(done, total):
+            self.stdout.write(f"  archived {done}/{total} showtimes")
+
+        showtimes, seats, bookings = archive_showtimes(
+            cutoff, batch_size=options["batch_size"], progress=progress
+        )
+        after = hot_table_sizes()
+
+        self.stdout.write(
+            f"Archived {showtimes} showtime(s): {bookings} booking(s) moved, {seats} seat row(s) removed."
+        )
+        for table, (rows, size) in before.items():
+            rows_after, size_after = after[table]
+            shrunk = (rows - rows_after) / rows * 100 if rows else 0
+            line = f"  {table}: {rows} -> {rows_after} rows (-{shrunk:.1f}%)"
+            if size is not None:
+                line += f", {size // 1024} -> {size_after // 1024} KiB"
+            self.stdout.write(line)
+
+        if after[next(iter(after))][1] is not None:
+            self.stdout.write("  (PostgreSQL reuses the freed space after VACUUM; run VACUUM FULL to return it.)")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,105 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from movies.audit import AUDIT_CHUNK, CHECKS, audit, repair
+from movies.availability import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Check seats and bookings for inconsistent state and print a JSON "
+        "report. Safe to run against production: every query covers one "
+        "bounded primary-key range and takes no locks unless --repair is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="append",
+            dest="checks",
+            choices=list(CHECKS),
+            help="Invariant to check (repeatable, default: all)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=AUDIT_CHUNK,
+            help=f"Primary keys per query (default: {AUDIT_CHUNK})",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes to spread the ranges over (default: 1)",
+        )
+        parser.add_argument(
+            "--counters",
+            action="store_true",
+            help="Also check the free / held / sold counters of every showtime",
+        )
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Fix what was found",
+        )
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=20,
+            help="Offending ids listed per check in the report (default: 20)",
+        )
+        parser.add_argument(
+            "--output",
+            metavar="PATH",
+            help="Write the report to PATH instead of stdout",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--chunk-size and --workers must be at least 1.")
+
+        def progress(done, total):
+            self.stderr.write(f"  checked {done}/{total} ranges")
+
+        started = timezone.now()
+        found = audit(
+            options["checks"],
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            progress=progress,
+        )
+
+        report = {
+            "started_at": started.isoformat(),
+            "checks": {
+                name: {"count": len(ids), "sample": ids[:options["sample"]]}
+                for name, ids in found.items()
+            },
+        }
+
+        if options["repair"]:
+            report["repaired"] = repair(found)
+
+        if options["counters"]:
+            drifted = reconcile(dry_run=not options["repair"])
+            report["counters"] = {
+                "count": len(drifted),
+                "sample": [
+                    {"theater": theater.id, "stored": list(stored), "actual": list(actual)}
+                    for theater, stored, actual in drifted[:options["sample"]]
+                ],
+            }
+            if options["repair"]:
+                report["repaired"]["counters"] = len(drifted)
+
+        report["finished_at"] = timezone.now().isoformat()
+        output = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+            self.stderr.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(output)
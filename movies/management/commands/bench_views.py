@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/sec and memory per concurrent connection of the "
+        "sync views under WSGI against the async views under ASGI."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=["both", "wsgi", "asgi"], default="both")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="URL to request (repeatable, default: /movies/)",
+        )
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or ["/movies/"]
+
+        if options["mode"] != "both":
+            # Child process: the URLconf already picked sync or async views
+            run = self._run_asgi if options["mode"] == "asgi" else self._run_wsgi
+            result = self._measure(run, paths, options["concurrency"], options["requests"])
+            self.stdout.write(json.dumps(result))
+            return
+
+        results = {}
+        for mode in ("wsgi", "asgi"):
+            results[mode] = self._spawn(mode, paths, options)
+
+        self.stdout.write(
+            f"{options['requests']} requests, {options['concurrency']} concurrent, paths: {', '.join(paths)}\n"
+        )
+        self.stdout.write(f"{'':6}{'req/s':>10}{'p50 ms':>10}{'errors':>8}{'KiB/conn':>10}{'RSS MiB':>10}")
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode.upper():6}{result['rps']:>10.1f}{result['p50_ms']:>10.1f}{result['errors']:>8}"
+                f"{result['kib_per_connection']:>10.1f}{result['max_rss_mib']:>10.1f}"
+            )
+
+    def _spawn(self, mode, paths, options):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+            "ASYNC_VIEWS": "True" if mode == "asgi" else "False",
+            # Measure the views, not the waiting room
+            "ADMISSION_CONTROL": "False",
+        }
+        command = [
+            sys.executable, "manage.py", "bench_views",
+            "--mode", mode,
+            "--concurrency", str(options["concurrency"]),
+            "--requests", str(options["requests"]),
+        ]
+        for path in paths:
+            command += ["--path", path]
+
+        result = subprocess.run(command, capture_output=True, text=True, env=env, cwd=settings.BASE_DIR)
+        if result.returncode:
+            raise CommandError(f"{mode} benchmark failed:\n{result.stderr}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def _measure(self, run, paths, concurrency, total):
+        per_worker = max(total // concurrency, 1)
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        latencies, errors = run(paths, concurrency, per_worker)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            "rps": len(latencies) / elapsed,
+            "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0,
+            "errors": errors,
+            "kib_per_connection": (peak - baseline) / concurrency / 1024,
+            # ru_maxrss is KiB on Linux
+            "max_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+
+    def _run_wsgi(self, paths, concurrency, per_worker):
+        def worker(index):
+            client = Client(raise_request_exception=False)
+            timings, failed = [], 0
+            for i in range(per_worker):
+                started = time.perf_counter()
+                response = client.get(paths[(index + i) % len(paths)])
+                timings.append(time.perf_counter() - started)
+                failed += response.status_code >= 400
+            return timings, failed
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(worker, range(concurrency)))
+
+        return [t for timings, _ in results for t in timings], sum(failed for _, failed in results)
+
+    def _run_asgi(self, paths, concurrency, per_worker):
+        async def worker(index):
+            client = AsyncClient(raise_request_exception=False)
+            timings, failed = [], 0
+            for i in range(per_worker):
+                started = time.perf_counter()
+                response = await client.get(paths[(index + i) % len(paths)])
+                timings.append(time.perf_counter() - started)
+                failed += response.status_code >= 400
+            return timings, failed
+
+        async def main():
+            return await asyncio.gather(*(worker(index) for index in range(concurrency)))
+
+        results = asyncio.run(main())
+        return [t for timings, _ in results for t in timings], sum(failed for _, failed in results)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.recommendations import TOP_K, build
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the \"people who booked this also booked\" tables from the "
+        "booking history. Run it periodically, e.g. nightly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=TOP_K,
+            help=f"Neighbours / recommendations to keep per movie and user (default: {TOP_K})",
+        )
+
+    def handle(self, *args, **options):
+        if options["top_k"] < 1:
+            raise CommandError("--top-k must be at least 1.")
+
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            raise CommandError("build_recommendations needs NumPy: pip install numpy")
+
+        def progress(stage, done, total):
+            self.stdout.write(f"  {stage}: {done}/{total} users")
+
+        movie_rows, user_rows = build(top_k=options["top_k"], progress=progress)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {movie_rows} movie neighbour(s) and {user_rows} user recommendation(s)."
+        ))
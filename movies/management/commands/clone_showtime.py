@@ -0,0 +1,33 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.bulk import clone_showtime
+from movies.models import Theater
+
+
+class Command(BaseCommand):
+    help = "Clone a showtime and its seat grid onto one or more new dates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("theater_id", type=int)
+        parser.add_argument(
+            "dates",
+            nargs="+",
+            type=date.fromisoformat,
+            help="Target dates as YYYY-MM-DD",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            theater = Theater.objects.get(id=options["theater_id"])
+        except Theater.DoesNotExist:
+            raise CommandError(f"Showtime {options['theater_id']} does not exist.")
+
+        def progress(done, total):
+            self.stdout.write(f"  cloned {done}/{total}")
+
+        clones = clone_showtime(theater, options["dates"], progress=progress)
+
+        for clone in clones:
+            self.stdout.write(self.style.SUCCESS(f"Created showtime {clone.id}: {clone}"))
@@ -0,0 +1,63 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+ENCODINGS = {".br": "brotli", ".gz": "gzip"}
+
+
+class Command(BaseCommand):
+    help = "Show how many bytes the precompressed static files (.br/.gz) save."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=10, help="Largest savings to list")
+
+    def handle(self, *args, **options):
+        root = settings.STATIC_ROOT
+        if not os.path.isdir(root):
+            raise CommandError(f"{root} does not exist, run collectstatic first.")
+
+        totals = {name: [0, 0, 0] for name in ENCODINGS.values()}  # files, original, compressed
+        uncompressed = [0, 0]
+        savings = []
+
+        for dirpath, _, filenames in os.walk(root):
+            present = set(filenames)
+            for filename in filenames:
+                if os.path.splitext(filename)[1] in ENCODINGS:
+                    continue
+
+                path = os.path.join(dirpath, filename)
+                size = os.path.getsize(path)
+                best = size
+
+                for suffix, name in ENCODINGS.items():
+                    if filename + suffix in present:
+                        compressed = os.path.getsize(path + suffix)
+                        totals[name][0] += 1
+                        totals[name][1] += size
+                        totals[name][2] += compressed
+                        best = min(best, compressed)
+
+                if best == size:
+                    uncompressed[0] += 1
+                    uncompressed[1] += size
+                else:
+                    savings.append((size - best, os.path.relpath(path, root)))
+
+        for name, (files, original, compressed) in totals.items():
+            if not files:
+                self.stdout.write(f"{name:>7}: no precompressed files")
+                continue
+            saved = original - compressed
+            self.stdout.write(
+                f"{name:>7}: {files} files, {original:,} -> {compressed:,} bytes "
+                f"(saved {saved:,}, {saved / original:.1%})"
+            )
+
+        self.stdout.write(f"  plain: {uncompressed[0]} files ({uncompressed[1]:,} bytes) served uncompressed")
+
+        if savings and options["top"]:
+            self.stdout.write("\nLargest savings (best encoding):")
+            for saved, path in sorted(savings, reverse=True)[:options["top"]]:
+                self.stdout.write(f"  {saved:>10,}  {path}")
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.bulk import BulkOperationError, move_bookings
+from movies.models import Theater
+
+
+class Command(BaseCommand):
+    help = "Move all bookings from a cancelled showtime onto another showtime."
+
+    def add_arguments(self, parser):
+        parser.add_argument("source_id", type=int, help="Cancelled showtime ID")
+        parser.add_argument("target_id", type=int, help="Replacement showtime ID")
+
+    def handle(self, *args, **options):
+        theaters = Theater.objects.in_bulk([options["source_id"], options["target_id"]])
+        for key in ("source_id", "target_id"):
+            if options[key] not in theaters:
+                raise CommandError(f"Showtime {options[key]} does not exist.")
+
+        def progress(done, total):
+            self.stdout.write(f"  moved {done}/{total}")
+
+        try:
+            moved = move_bookings(
+                theaters[options["source_id"]],
+                theaters[options["target_id"]],
+                progress=progress,
+            )
+        except BulkOperationError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(f"Moved {moved} booking(s)."))
@@ -0,0 +1,75 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# "import time:       412 |       1520 |   django.urls"
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# The URLconf, and with it every view module, is only loaded by the first
+# request; load it too so the profile shows what a cold start pays for
+CHILD = "import {module}\nfrom django.urls import get_resolver\nget_resolver().url_patterns"
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile the cold-start import cost of the WSGI entry point "
+        "and URLconf (python -X importtime) and print a per-module breakdown."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--module", default="bookmyseat.wsgi", help="Entry point to import")
+        parser.add_argument("--top", type=int, default=20, help="Modules to list")
+        parser.add_argument(
+            "--fail-above",
+            type=float,
+            metavar="MS",
+            help="Exit with an error if the total import time exceeds MS milliseconds",
+        )
+
+    def handle(self, *args, **options):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE, "WARM_UP": "False"}
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", CHILD.format(module=options["module"])],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=settings.BASE_DIR,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+
+        modules = []
+        packages = defaultdict(int)
+        total = 0
+
+        for line in result.stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if not match:
+                continue
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((int(cumulative_us), int(self_us), name))
+            packages[name.split(".")[0]] += int(self_us)
+            if len(indent) == 1:
+                # Top-level imports; their cumulative times add up to the total
+                total += int(cumulative_us)
+
+        self.stdout.write(f"Importing {options['module']} and the URLconf took {total / 1000:.1f} ms\n")
+
+        self.stdout.write("By package (self time):")
+        for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:options["top"]]:
+            self.stdout.write(f"  {self_us / 1000:>8.1f} ms  {name}")
+
+        self.stdout.write("\nSlowest modules (cumulative / self):")
+        for cumulative_us, self_us, name in sorted(modules, reverse=True)[:options["top"]]:
+            self.stdout.write(f"  {cumulative_us / 1000:>8.1f} / {self_us / 1000:>6.1f} ms  {name}")
+
+        if options["fail_above"] is not None and total / 1000 > options["fail_above"]:
+            raise CommandError(
+                f"Cold-start imports took {total / 1000:.1f} ms "
+                f"(limit {options['fail_above']:.0f} ms)"
+            )
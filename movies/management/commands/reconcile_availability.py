@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from movies.availability import reconcile
+from movies.models import Theater
+
+
+class Command(BaseCommand):
+    help = "Recompute the free / held / sold seat counters of showtimes and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "theater_ids",
+            nargs="*",
+            type=int,
+            help="Showtime IDs to check (default: all)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted showtimes, do not fix them",
+        )
+
+    def handle(self, *args, **options):
+        theaters = Theater.objects.all()
+        if options["theater_ids"]:
+            theaters = theaters.filter(id__in=options["theater_ids"])
+
+        def progress(done, total):
+            self.stdout.write(f"  checked {done}/{total}")
+
+        drifted = reconcile(theaters, dry_run=options["dry_run"], progress=progress)
+
+        for theater, stored, actual in drifted:
+            self.stdout.write(
+                f"  showtime {theater.id}: free/held/sold "
+                f"{'/'.join(map(str, stored))} -> {'/'.join(map(str, actual))}"
+            )
+
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drifted)} drifted showtime(s)."))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from movies.bulk import release_stale_holds
+from movies.models import Seat
+
+
+class Command(BaseCommand):
+    help = "Force-release every stale seat hold, optionally limited to some showtimes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "theater_ids",
+            nargs="*",
+            type=int,
+            help="Showtime IDs to release holds on (default: all)",
+        )
+
+    def handle(self, *args, **options):
+        seats = Seat.objects.all()
+        if options["theater_ids"]:
+            seats = seats.filter(theater_id__in=options["theater_ids"])
+
+        def progress(done, total):
+            self.stdout.write(f"  released {done}/{total}")
+
+        released = release_stale_holds(seats, progress=progress)
+        self.stdout.write(self.style.SUCCESS(f"Released {released} stale hold(s)."))
@@ -0,0 +1,57 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from movies.tracing import read_spans, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarise the exported booking funnel spans: latency percentiles "
+        "per step, how far traces got, and the slowest step."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir",
+            help="Span directory (default: settings.TRACING['DIR'])",
+        )
+        parser.add_argument(
+            "--hours",
+            type=float,
+            help="Only spans started in the last HOURS hours",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the summary as JSON",
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(hours=options["hours"]) if options["hours"] else None
+        summary = summarize(read_spans(options["dir"], since))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+
+        if not summary["spans"]:
+            self.stdout.write("No spans found.")
+            return
+
+        self.stdout.write(f"{summary['spans']} spans, {summary['traces']} traces entering the funnel\n")
+        self.stdout.write(
+            f"{'step':<16}{'traces':>8}{'reached':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'db ms':>8}{'lock ms':>9}{'ext ms':>8}"
+        )
+        for step in summary["steps"]:
+            reached = f"{step['reached_pct']}%" if step["reached_pct"] is not None else "-"
+            self.stdout.write(
+                f"{step['step']:<16}{step['traces']:>8}{reached:>9}"
+                f"{step.get('p50_ms', '-'):>10}{step.get('p95_ms', '-'):>10}{step.get('p99_ms', '-'):>10}"
+                f"{step.get('avg_db_ms', '-'):>8}{step.get('avg_lock_ms', '-'):>9}{step.get('avg_external_ms', '-'):>8}"
+            )
+
+        self.stdout.write(self.style.WARNING(f"\nSlowest step (p95): {summary['slowest_step']}"))
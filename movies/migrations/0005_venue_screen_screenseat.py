@@ -0,0 +1,64 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_booking_amount_paid_booking_is_paid_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Screen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ScreenSeat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seat_number', models.CharField(max_length=10)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Venue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('city', models.CharField(blank=True, max_length=100)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='theater',
+            name='screen',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='showtimes', to='movies.screen'),
+        ),
+        migrations.AddField(
+            model_name='screenseat',
+            name='screen',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='layout', to='movies.screen'),
+        ),
+        migrations.AddField(
+            model_name='screen',
+            name='venue',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='screens', to='movies.venue'),
+        ),
+        migrations.AddConstraint(
+            model_name='screenseat',
+            constraint=models.UniqueConstraint(fields=('screen', 'seat_number'), name='unique_seat_per_screen'),
+        ),
+        migrations.AddConstraint(
+            model_name='screen',
+            constraint=models.UniqueConstraint(fields=('venue', 'name'), name='unique_screen_per_venue'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+from django.db import migrations
+
+
+def split_theater_seats(apps, schema_editor):
+    """Turn every Theater's seat grid into a reusable Screen layout.
+
+    Showtimes with the same theater name share a Venue; showtimes of that
+    venue with an identical set of seat numbers share a Screen. Afterwards
+    only held / sold Seat rows are kept.
+    """
+    Theater = apps.get_model('movies', 'Theater')
+    Seat = apps.get_model('movies', 'Seat')
+    Venue = apps.get_model('movies', 'Venue')
+    Screen = apps.get_model('movies', 'Screen')
+    ScreenSeat = apps.get_model('movies', 'ScreenSeat')
+
+    venues = {}
+    screens = {}
+
+    for theater in Theater.objects.filter(screen__isnull=True).order_by('id').iterator():
+        numbers = list(dict.fromkeys(
+            Seat.objects.filter(theater=theater)
+            .order_by('id')
+            .values_list('seat_number', flat=True)
+        ))
+        if not numbers:
+            continue
+
+        venue = venues.get(theater.name)
+        if venue is None:
+            venue = venues[theater.name] = Venue.objects.create(name=theater.name)
+
+        key = (venue.id, frozenset(numbers))
+        screen = screens.get(key)
+        if screen is None:
+            count = sum(1 for venue_id, _ in screens if venue_id == venue.id)
+            screen = screens[key] = Screen.objects.create(venue=venue, name=f'Screen {count + 1}')
+            ScreenSeat.objects.bulk_create(
+                [ScreenSeat(screen=screen, seat_number=number) for number in numbers],
+                batch_size=500,
+            )
+
+        theater.screen = screen
+        theater.save(update_fields=['screen'])
+
+        Seat.objects.filter(
+            theater=theater,
+            is_booked=False,
+            is_reserved=False,
+            booking__isnull=True,
+        ).delete()
+
+
+def merge_theater_seats(apps, schema_editor):
+    Theater = apps.get_model('movies', 'Theater')
+    Seat = apps.get_model('movies', 'Seat')
+    Venue = apps.get_model('movies', 'Venue')
+    ScreenSeat = apps.get_model('movies', 'ScreenSeat')
+
+    for theater in Theater.objects.filter(screen__isnull=False).order_by('id').iterator():
+        existing = set(
+            Seat.objects.filter(theater=theater).values_list('seat_number', flat=True)
+        )
+        layout = (
+            ScreenSeat.objects.filter(screen_id=theater.screen_id)
+            .order_by('id')
+            .values_list('seat_number', flat=True)
+        )
+        Seat.objects.bulk_create(
+            [Seat(theater=theater, seat_number=number) for number in layout if number not in existing],
+            batch_size=500,
+        )
+
+    Theater.objects.update(screen=None)
+    Venue.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_venue_screen_screenseat'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_theater_seats, merge_theater_seats),
+    ]
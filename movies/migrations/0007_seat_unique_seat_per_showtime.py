@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_split_theater_seats_into_screens'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='seat',
+            constraint=models.UniqueConstraint(fields=('theater', 'seat_number'), name='unique_seat_per_showtime'),
+        ),
+    ]
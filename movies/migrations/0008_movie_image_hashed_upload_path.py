@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:05
+
+import movies.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0007_seat_unique_seat_per_showtime'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='movie',
+            name='image',
+            field=models.ImageField(upload_to=movies.models.poster_upload_path),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0008_movie_image_hashed_upload_path'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='theater',
+            index=models.Index(fields=['movie', 'time'], name='theater_movie_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='theater',
+            index=models.Index(fields=['time'], name='theater_time_idx'),
+        ),
+    ]
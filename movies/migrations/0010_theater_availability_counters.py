@@ -0,0 +1,58 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:11
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_counters(apps, schema_editor):
+    Theater = apps.get_model('movies', 'Theater')
+    ScreenSeat = apps.get_model('movies', 'ScreenSeat')
+
+    layout_sizes = dict(
+        ScreenSeat.objects.values('screen').annotate(total=Count('id')).values_list('screen', 'total')
+    )
+    theaters = Theater.objects.annotate(
+        sold=Count('seats', filter=Q(seats__is_booked=True)),
+        held=Count('seats', filter=Q(seats__is_reserved=True, seats__is_booked=False)),
+        rows=Count('seats'),
+    )
+
+    batch = []
+    for theater in theaters.iterator():
+        total = layout_sizes.get(theater.screen_id, 0) if theater.screen_id else theater.rows
+        theater.seats_free = total - theater.sold - theater.held
+        theater.seats_held = theater.held
+        theater.seats_sold = theater.sold
+        batch.append(theater)
+
+        if len(batch) == 500:
+            Theater.objects.bulk_update(batch, ['seats_free', 'seats_held', 'seats_sold'])
+            batch = []
+
+    Theater.objects.bulk_update(batch, ['seats_free', 'seats_held', 'seats_sold'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0009_theater_time_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='theater',
+            name='seats_free',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='theater',
+            name='seats_held',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='theater',
+            name='seats_sold',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0011_recommendations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='theater',
+            name='archived',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='ArchivedSeat',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('seat_number', models.CharField(max_length=10)),
+                ('is_booked', models.BooleanField(default=False)),
+                ('theater', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_seats', to='movies.theater')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedBooking',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('is_paid', models.BooleanField(default=False)),
+                ('payment_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('amount_paid', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('booked_at', models.DateTimeField()),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='movies.movie')),
+                ('theater', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='movies.theater')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_bookings', to=settings.AUTH_USER_MODEL)),
+                ('seat', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='movies.archivedseat')),
+            ],
+        ),
+    ]
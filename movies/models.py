@@ -1,13 +1,29 @@
+import hashlib
+import os
+
 from django.db import models
 from django.contrib.auth.models import User
 from urllib.parse import urlparse, parse_qs
 from django.utils import timezone
 from datetime import timedelta
 
+# How long a seat stays held for a user before it is released again
+RESERVATION_TIMEOUT = timedelta(minutes=5)
+
 
 # =========================
 # MOVIE MODEL
 # =========================
+def poster_upload_path(instance, filename):
+    # Content hash in the name lets posters be cached forever (see bookmyseat/media.py)
+    digest = hashlib.md5(usedforsecurity=False)
+    for chunk in instance.image.chunks():
+        digest.update(chunk)
+
+    stem, ext = os.path.splitext(os.path.basename(filename))
+    return f"movies/{stem}.{digest.hexdigest()[:12]}{ext.lower()}"
+
+
 class Movie(models.Model):
     GENRE_CHOICES = [
         ("Action", "Action"),
@@ -27,7 +43,7 @@ class Movie(models.Model):
     ]
 
     name = models.CharField(max_length=255)
-    image = models.ImageField(upload_to="movies/")
+    image = models.ImageField(upload_to=poster_upload_path)
     rating = models.DecimalField(max_digits=3, decimal_places=1)
     cast = models.TextField()
     description = models.TextField(blank=True, null=True)
@@ -67,20 +83,93 @@ class Movie(models.Model):
 
 
 # =========================
-# THEATER MODEL
+# VENUE / SCREEN MODELS (Seat layout defined once per screen)
+# =========================
+class Venue(models.Model):
+    name = models.CharField(max_length=255)
+    city = models.CharField(max_length=100, blank=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Screen(models.Model):
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='screens')
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['venue', 'name'], name='unique_screen_per_venue'),
+        ]
+
+    def __str__(self):
+        return f'{self.venue.name} - {self.name}'
+
+
+class ScreenSeat(models.Model):
+    screen = models.ForeignKey(Screen, on_delete=models.CASCADE, related_name='layout')
+    seat_number = models.CharField(max_length=10)
+
+    class Meta:
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['screen', 'seat_number'], name='unique_seat_per_screen'),
+        ]
+
+    def __str__(self):
+        return f'{self.seat_number} on {self.screen}'
+
+
+# =========================
+# THEATER MODEL (One showtime)
 # =========================
 class Theater(models.Model):
     name = models.CharField(max_length=255)
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='theaters')
     time = models.DateTimeField()
 
+    # ✅ Screen-backed showtimes only store Seat rows for held / sold seats
+    screen = models.ForeignKey(
+        Screen,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='showtimes'
+    )
+
+    # ✅ Availability counters, kept up to date by movies/availability.py
+    seats_free = models.IntegerField(default=0)
+    seats_held = models.IntegerField(default=0)
+    seats_sold = models.IntegerField(default=0)
+
+    # ✅ Seats / bookings of archived showtimes live in the Archived* tables
+    archived = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # Upcoming showtimes of one movie / of every movie in a time window
+            models.Index(fields=['movie', 'time'], name='theater_movie_time_idx'),
+            models.Index(fields=['time'], name='theater_time_idx'),
+        ]
+
     def __str__(self):
         return f'{self.name} - {self.movie.name} at {self.time}'
 
+    def save(self, *args, **kwargs):
+        # A new screen-backed showtime starts with the whole layout free.
+        # Legacy showtimes start at 0 and count their Seat rows as they are
+        # added (admin, clone_showtime); run reconcile_availability after
+        # loading seats any other way.
+        if self._state.adding and self.screen_id and not self.seats_free:
+            self.seats_free = ScreenSeat.objects.filter(screen_id=self.screen_id).count()
+        super().save(*args, **kwargs)
+
 
 # =========================
 # SEAT MODEL (User-Specific Reservation)
 # =========================
+# For screen-backed showtimes a row only exists while the seat is held or
+# sold; free seats come from the screen layout (see movies/seating.py).
 class Seat(models.Model):
     theater = models.ForeignKey(Theater, on_delete=models.CASCADE, related_name='seats')
     seat_number = models.CharField(max_length=10)
@@ -100,9 +189,14 @@ class Seat(models.Model):
         related_name="reserved_seats"
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['theater', 'seat_number'], name='unique_seat_per_showtime'),
+        ]
+
     def is_reservation_expired(self):
         if self.is_reserved and self.reserved_at:
-            return timezone.now() > self.reserved_at + timedelta(minutes=5)
+            return timezone.now() > self.reserved_at + RESERVATION_TIMEOUT
         return False
 
     def __str__(self):
@@ -129,3 +223,68 @@ class Booking(models.Model):
 
     def __str__(self):
         return f'Booking by {self.user.username} for {self.seat.seat_number}'
+
+
+# =========================
+# ARCHIVE (Seats / bookings of past showtimes, see movies/archive.py)
+# =========================
+# Rows keep the id they had in the hot table (BigAutoField, hence BigIntegerField).
+class ArchivedSeat(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    theater = models.ForeignKey(Theater, on_delete=models.CASCADE, related_name='archived_seats')
+    seat_number = models.CharField(max_length=10)
+    is_booked = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f'{self.seat_number} in {self.theater.name} (archived)'
+
+
+class ArchivedBooking(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_bookings")
+    seat = models.OneToOneField(ArchivedSeat, on_delete=models.CASCADE)
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE)
+    theater = models.ForeignKey(Theater, on_delete=models.CASCADE)
+
+    is_paid = models.BooleanField(default=False)
+    payment_id = models.CharField(max_length=255, blank=True, null=True)
+    amount_paid = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    booked_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'Booking by {self.user.username} for {self.seat.seat_number} (archived)'
+
+
+# =========================
+# RECOMMENDATIONS (Built offline by `manage.py build_recommendations`)
+# =========================
+class MovieNeighbour(models.Model):
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='neighbours')
+    neighbour = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['movie', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['movie', 'rank'], name='unique_neighbour_rank'),
+        ]
+
+    def __str__(self):
+        return f'{self.neighbour.name} for {self.movie.name} (#{self.rank})'
+
+
+class UserRecommendation(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='recommendations')
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['user', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'rank'], name='unique_recommendation_rank'),
+        ]
+
+    def __str__(self):
+        return f'{self.movie.name} for {self.user.username} (#{self.rank})'
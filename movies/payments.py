@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.mail import send_mail
+
+from .models import Seat, Booking
+from .availability import adjust_many
+
+
+def get_stripe():
+    # The Stripe SDK is slow to import, so keep it off the cold-start path
+    # and only load it once a checkout actually needs it.
+    import stripe
+
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    return stripe
+
+
+def fulfil_checkout(user, payment_intent):
+    """Turn the user's held seats into paid bookings (once per payment)."""
+    seats = Seat.objects.filter(
+        is_reserved=True,
+        reserved_by=user
+    )
+
+    if seats.exists() and not Booking.objects.filter(payment_id=payment_intent).exists():
+        movie_name = seats.first().theater.movie.name
+        sold_in = []
+
+        for seat in seats:
+            Booking.objects.create(
+                user=user,
+                seat=seat,
+                movie=seat.theater.movie,
+                theater=seat.theater,
+                is_paid=True,
+                payment_id=payment_intent,
+                amount_paid=10
+            )
+
+            seat.is_reserved = False
+            seat.is_booked = True
+            seat.reserved_by = None
+            seat.save()
+            sold_in.append(seat.theater_id)
+
+        adjust_many(sold_in, held=-1, sold=1)
+
+        # Email Confirmation
+        if user.email:
+            send_mail(
+                subject="Booking Confirmation",
+                message=f"Your booking for {movie_name} is confirmed.",
+                from_email=None,
+                recipient_list=[user.email],
+                fail_silently=True,
+            )
@@ -0,0 +1,157 @@
+"""
+"People who booked this also booked" recommendations.
+
+``build`` runs offline (``manage.py build_recommendations``): it turns the
+booking history into a user x movie matrix, computes cosine similarity
+between movies from their co-occurrence counts with NumPy, and stores the
+top neighbours per movie and the top unseen movies per user. Pages only do
+one indexed lookup against those tables.
+"""
+
+from django.db import transaction
+
+from .models import ArchivedBooking, Booking, MovieNeighbour, UserRecommendation
+
+# Neighbours / recommendations stored per movie and per user
+TOP_K = 12
+
+# Movies shown in a recommendation rail
+RAIL_SIZE = 4
+
+# Users turned into a dense block of the matrix at a time
+USER_BLOCK = 2000
+
+# Rows per INSERT when saving the results
+SAVE_BATCH = 1000
+
+
+# =========================
+# LOOKUPS (one query on the (movie, rank) / (user, rank) indexes)
+# =========================
+def _user_rail(user, limit):
+    return UserRecommendation.objects.filter(user=user).select_related("movie")[:limit]
+
+
+def _movie_rail(movie, limit):
+    return MovieNeighbour.objects.filter(movie=movie).select_related("neighbour")[:limit]
+
+
+def recommended_for(user, limit=RAIL_SIZE):
+    if not user.is_authenticated:
+        return []
+    return [row.movie for row in _user_rail(user, limit)]
+
+
+async def arecommended_for(user, limit=RAIL_SIZE):
+    if not user.is_authenticated:
+        return []
+    return [row.movie async for row in _user_rail(user, limit).aiterator()]
+
+
+def also_booked(movie, limit=RAIL_SIZE):
+    return [row.neighbour for row in _movie_rail(movie, limit)]
+
+
+async def aalso_booked(movie, limit=RAIL_SIZE):
+    return [row.neighbour async for row in _movie_rail(movie, limit).aiterator()]
+
+
+# =========================
+# OFFLINE BUILD
+# =========================
+def _top_k(np, scores, k):
+    """(columns, values) of the ``k`` largest scores of each row, best first."""
+    k = min(k, scores.shape[1])
+    columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    values = np.take_along_axis(scores, columns, axis=1)
+    order = np.argsort(-values, axis=1, kind="stable")
+    return np.take_along_axis(columns, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+
+def _user_blocks(np, user_index, movie_index, n_users, n_movies):
+    """Yield (first user, dense 0/1 block) for USER_BLOCK users at a time.
+
+    ``user_index`` must be sorted.
+    """
+    for start in range(0, n_users, USER_BLOCK):
+        stop = min(start + USER_BLOCK, n_users)
+        lo, hi = np.searchsorted(user_index, [start, stop])
+        block = np.zeros((stop - start, n_movies), dtype=np.float32)
+        block[user_index[lo:hi] - start, movie_index[lo:hi]] = 1
+        yield start, block
+
+
+def build(top_k=TOP_K, progress=None):
+    """Recompute both recommendation tables. Returns (movie rows, user rows)."""
+    import numpy as np
+
+    history = set()
+    for model in (Booking, ArchivedBooking):
+        history.update(model.objects.values_list("user_id", "movie_id").distinct())
+
+    pairs = np.array(sorted(history), dtype=np.int64).reshape(-1, 2)
+
+    neighbours = []
+    recommendations = []
+
+    if len(pairs):
+        user_ids, user_index = np.unique(pairs[:, 0], return_inverse=True)
+        movie_ids, movie_index = np.unique(pairs[:, 1], return_inverse=True)
+        n_users, n_movies = len(user_ids), len(movie_ids)
+
+        # Co-occurrence: how many users booked both movie i and movie j
+        co = np.zeros((n_movies, n_movies), dtype=np.float32)
+        for start, block in _user_blocks(np, user_index, movie_index, n_users, n_movies):
+            co += block.T @ block
+            if progress:
+                progress("co-occurrence", min(start + USER_BLOCK, n_users), n_users)
+
+        norms = np.sqrt(np.diag(co))
+        similarity = co / np.outer(norms, norms)
+        np.fill_diagonal(similarity, 0)
+
+        if n_movies > 1:
+            columns, values = _top_k(np, similarity, top_k)
+            for row, movie_id in enumerate(movie_ids.tolist()):
+                rank = 0
+                for column, score in zip(columns[row].tolist(), values[row].tolist()):
+                    if score <= 0:
+                        break
+                    rank += 1
+                    neighbours.append(MovieNeighbour(
+                        movie_id=movie_id,
+                        neighbour_id=int(movie_ids[column]),
+                        rank=rank,
+                        score=score,
+                    ))
+
+            # A user's score for a movie: summed similarity to what they booked
+            for start, block in _user_blocks(np, user_index, movie_index, n_users, n_movies):
+                scores = block @ similarity
+                scores[block > 0] = -np.inf
+                columns, values = _top_k(np, scores, top_k)
+
+                for row in range(len(block)):
+                    user_id = int(user_ids[start + row])
+                    rank = 0
+                    for column, score in zip(columns[row].tolist(), values[row].tolist()):
+                        if score <= 0:
+                            break
+                        rank += 1
+                        recommendations.append(UserRecommendation(
+                            user_id=user_id,
+                            movie_id=int(movie_ids[column]),
+                            rank=rank,
+                            score=score,
+                        ))
+
+                if progress:
+                    progress("users", min(start + USER_BLOCK, n_users), n_users)
+
+    with transaction.atomic():
+        MovieNeighbour.objects.all().delete()
+        UserRecommendation.objects.all().delete()
+        MovieNeighbour.objects.bulk_create(neighbours, batch_size=SAVE_BATCH)
+        UserRecommendation.objects.bulk_create(recommendations, batch_size=SAVE_BATCH)
+
+    return len(neighbours), len(recommendations)
@@ -0,0 +1,147 @@
+from django.db import IntegrityError, transaction
+from django.http import Http404
+from django.utils import timezone
+
+from bookmyseat.db_router import mark_written
+
+from .models import Seat, ScreenSeat, Theater
+from .allocation import best_block
+from .availability import adjust
+
+
+# =========================
+# SEAT MAP
+# =========================
+def _merge_layout(theater, stored, layout):
+    by_number = {seat.seat_number: seat for seat in stored}
+    return [
+        by_number.get(number) or Seat(theater=theater, seat_number=number)
+        for number in layout
+    ]
+
+
+def _stored_seats(theater):
+    return (
+        Seat.objects.filter(theater=theater)
+        .select_related("reserved_by")
+        .order_by("id")
+    )
+
+
+def _layout(theater):
+    return ScreenSeat.objects.filter(screen_id=theater.screen_id).values_list(
+        "seat_number", flat=True
+    )
+
+
+def seat_map(theater):
+    """Every seat of a showtime, in layout order.
+
+    Screen-backed showtimes only store rows for held / sold seats, so free
+    seats are returned as unsaved ``Seat`` instances built from the layout.
+    """
+    stored = list(_stored_seats(theater))
+    if not theater.screen_id:
+        return stored
+    return _merge_layout(theater, stored, _layout(theater))
+
+
+async def aseat_map(theater):
+    stored = [seat async for seat in _stored_seats(theater).aiterator()]
+    if not theater.screen_id:
+        return stored
+    layout = [number async for number in _layout(theater).aiterator()]
+    return _merge_layout(theater, stored, layout)
+
+
+# =========================
+# HOLD SEATS
+# =========================
+def hold_seats(theater, user, seat_numbers):
+    """Hold ``seat_numbers`` for ``user`` and return the ones that were unavailable."""
+    seat_numbers = list(dict.fromkeys(seat_numbers))
+    unavailable = []
+    now = timezone.now()
+
+    with transaction.atomic():
+        stored = {
+            seat.seat_number: seat
+            for seat in Seat.objects.select_for_update().filter(
+                theater=theater, seat_number__in=seat_numbers
+            )
+        }
+
+        if theater.screen_id:
+            valid = set(
+                ScreenSeat.objects.filter(
+                    screen_id=theater.screen_id, seat_number__in=seat_numbers
+                ).values_list("seat_number", flat=True)
+            )
+        else:
+            valid = set(stored)
+
+        if len(valid) != len(seat_numbers):
+            raise Http404("No such seat for this showtime.")
+
+        to_update = []
+        to_create = []
+        newly_held = 0
+        for number in seat_numbers:
+            seat = stored.get(number)
+            if seat is None:
+                to_create.append(Seat(
+                    theater=theater,
+                    seat_number=number,
+                    is_reserved=True,
+                    reserved_at=now,
+                    reserved_by=user,
+                ))
+            elif seat.is_booked or (seat.is_reserved and seat.reserved_by_id != user.id):
+                unavailable.append(number)
+            else:
+                to_update.append(seat.id)
+                newly_held += not seat.is_reserved
+
+        if Seat.objects.filter(id__in=to_update).update(
+            is_reserved=True,
+            reserved_at=now,
+            reserved_by=user,
+        ):
+            mark_written()
+
+        if to_create:
+            try:
+                with transaction.atomic():
+                    Seat.objects.bulk_create(to_create)
+            except IntegrityError:
+                # Someone else grabbed one of these seats in the meantime
+                unavailable += [seat.seat_number for seat in to_create]
+            else:
+                newly_held += len(to_create)
+
+        adjust(theater.id, free=-newly_held, held=newly_held)
+
+    return unavailable
+
+
+def hold_best_seats(theater, user, count):
+    """Hold the best ``count`` free seats side by side and return their numbers.
+
+    Returns an empty list when no such block is free.
+    """
+    with transaction.atomic():
+        # One allocation per showtime at a time, so the block we pick from the
+        # seat map is still free when we hold it
+        Theater.objects.select_for_update().filter(id=theater.id).exists()
+
+        block = best_block(seat_map(theater), count)
+        if not block:
+            return []
+
+        if hold_seats(theater, user, block):
+            # A seat was taken through the regular seat picker meanwhile;
+            # don't leave the user with half a block
+            transaction.set_rollback(True)
+            return []
+
+    return block
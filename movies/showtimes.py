@@ -0,0 +1,85 @@
+from datetime import datetime, time, timedelta
+
+from django.core.paginator import Paginator
+from django.utils import timezone
+
+from .models import Theater
+
+# Showtimes per page on the listing / search pages
+PER_PAGE = 40
+
+
+# =========================
+# QUERIES (backed by the (movie, time) and (time) indexes)
+# =========================
+def upcoming_showtimes(queryset=None):
+    queryset = Theater.objects.all() if queryset is None else queryset
+    return (
+        queryset.filter(time__gte=timezone.now())
+        .select_related("movie", "screen__venue")
+        .order_by("time", "id")
+    )
+
+
+def showtimes_between(day, start, end):
+    """Upcoming showtimes of every movie on ``day`` between ``start`` and ``end`` (local time)."""
+    start_at = timezone.make_aware(datetime.combine(day, start))
+    if end <= start:
+        # e.g. 22:00 - 01:00 runs past midnight
+        end_at = timezone.make_aware(datetime.combine(day + timedelta(days=1), end))
+    else:
+        end_at = timezone.make_aware(datetime.combine(day, end))
+
+    return upcoming_showtimes().filter(time__gte=start_at, time__lt=end_at)
+
+
+def parse_window(params):
+    """(day, start, end) from ?date=YYYY-MM-DD&from=HH:MM&to=HH:MM, defaulting to the rest of today."""
+    now = timezone.localtime()
+
+    try:
+        day = datetime.strptime(params.get("date", ""), "%Y-%m-%d").date()
+    except ValueError:
+        day = now.date()
+
+    try:
+        start = datetime.strptime(params.get("from", ""), "%H:%M").time()
+    except ValueError:
+        start = time(0, 0)
+
+    try:
+        end = datetime.strptime(params.get("to", ""), "%H:%M").time()
+    except ValueError:
+        end = time(23, 59, 59)
+
+    return day, start, end
+
+
+# =========================
+# GROUPING + PAGINATION
+# =========================
+def venue_name(theater):
+    return theater.screen.venue.name if theater.screen_id else theater.name
+
+
+def group_by_date_and_venue(theaters):
+    """[(date, [(venue, [showtimes])])] keeping the time order of ``theaters``."""
+    days = {}
+    for theater in theaters:
+        day = timezone.localtime(theater.time).date()
+        days.setdefault(day, {}).setdefault(venue_name(theater), []).append(theater)
+
+    return [(day, list(venues.items())) for day, venues in days.items()]
+
+
+def paginate(queryset, number, per_page=PER_PAGE):
+    return Paginator(queryset, per_page).get_page(number)
+
+
+async def apaginate(queryset, number, per_page=PER_PAGE):
+    paginator = Paginator(queryset, per_page)
+    # Fill the cached count asynchronously so get_page() does not query
+    paginator.count = await queryset.acount()
+    page = paginator.get_page(number)
+    page.object_list = [item async for item in page.object_list.aiterator()]
+    return page
@@ -1,3 +1,572 @@
-from django.test import TestCase
+import os
+import tempfile
+import timeit
+from datetime import date, timedelta
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from bookmyseat.db_router import PIN_COOKIE
+from bookmyseat.media import serve_media
+
+from .admission import _key, queue_position
+from .allocation import best_block, parse_seat_number
+from .archive import archive_showtimes, paid_revenue, user_bookings
+from .audit import audit, repair
+from .availability import reconcile
+from .bulk import BulkOperationError, clone_showtime, move_bookings, release_stale_holds
+from .models import (
+    Movie, Venue, Screen, ScreenSeat, Theater, Seat, Booking, ArchivedBooking, RESERVATION_TIMEOUT,
+)
+from .seating import hold_best_seats, hold_seats, seat_map
+
+
+class ShowtimeFixture:
+    """A user and a screen-backed showtime with a four-seat layout."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("viewer", password="pw")
+        cls.movie = Movie.objects.create(
+            name="Test Movie", image="movies/test.jpg", rating=8, cast="Nobody"
+        )
+        cls.screen = Screen.objects.create(venue=Venue.objects.create(name="Venue"), name="1")
+        ScreenSeat.objects.bulk_create(
+            [ScreenSeat(screen=cls.screen, seat_number=f"A{n}") for n in range(1, 5)]
+        )
+        cls.theater = Theater.objects.create(
+            name="Venue", movie=cls.movie, screen=cls.screen, time=timezone.now()
+        )
+
+
+# =========================
+# ADMISSION CONTROL
+# =========================
+# No refill, so exactly BURST users get in
+@override_settings(ADMISSION_CONTROL={"RATE": 0.0, "BURST": 2})
+class AdmissionQueueTests(SimpleTestCase):
+    theater_id = 1
+
+    def setUp(self):
+        cache.clear()
+
+    def position(self, user_id):
+        return queue_position(self.theater_id, SimpleNamespace(id=user_id))
+
+    def test_queue_is_first_come_first_served(self):
+        self.assertEqual([self.position(user_id) for user_id in range(1, 6)], [0, 0, 1, 2, 3])
+        # Asking again keeps the same place, admitted users keep their pass
+        self.assertEqual(self.position(4), 2)
+        self.assertEqual(self.position(1), 0)
+
+    def test_expired_tail_does_not_restart_behind_head(self):
+        for user_id in range(1, 4):
+            self.position(user_id)
+        self.assertEqual(cache.get(_key(self.theater_id, "head")), 2)
+
+        # The tail is evicted while the head survives
+        cache.delete(_key(self.theater_id, "tail"))
+
+        self.assertEqual(self.position(10), 1)
+        self.assertEqual(self.position(11), 2)
+        self.assertEqual(self.position(3), 1)
+
+
+# =========================
+# REPLICA PINNING
+# =========================
+@override_settings(ADMISSION_CONTROL={"ENABLED": False})
+class PrimaryPinningTests(ShowtimeFixture, TestCase):
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = f"/movies/theater/{self.theater.id}/seats/book/"
+
+    def test_seat_page_does_not_pin(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_holding_seats_pins(self):
+        response = self.client.post(self.url, {"seats": ["A1"]})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+
+# =========================
+# AVAILABILITY COUNTERS
+# =========================
+class AdminCounterTests(ShowtimeFixture, TestCase):
+    def setUp(self):
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "pw")
+        )
+
+    def counters(self, theater):
+        theater.refresh_from_db()
+        return theater.seats_free, theater.seats_held, theater.seats_sold
+
+    def test_seats_added_to_legacy_showtime_are_counted(self):
+        legacy = Theater.objects.create(name="Legacy", movie=self.movie, time=timezone.now())
+        for number in ("B1", "B2"):
+            self.client.post("/admin/movies/seat/add/", {"theater": legacy.id, "seat_number": number})
+        self.assertEqual(self.counters(legacy), (2, 0, 0))
+
+        seat = legacy.seats.get(seat_number="B1")
+        self.client.post(f"/admin/movies/seat/{seat.id}/delete/", {"post": "yes"})
+        self.assertEqual(self.counters(legacy), (1, 0, 0))
+
+    def test_layout_change_recounts_showtimes_of_the_screen(self):
+        layout = list(self.screen.layout.order_by("id"))
+        data = {
+            "venue": self.screen.venue_id,
+            "name": self.screen.name,
+            "layout-TOTAL_FORMS": len(layout) + 2,
+            "layout-INITIAL_FORMS": len(layout),
+            "layout-MIN_NUM_FORMS": 0,
+            "layout-MAX_NUM_FORMS": 1000,
+        }
+        for index, seat in enumerate(layout):
+            data[f"layout-{index}-id"] = seat.id
+            data[f"layout-{index}-screen"] = self.screen.id
+            data[f"layout-{index}-seat_number"] = seat.seat_number
+        for index, number in enumerate(("A5", "A6"), start=len(layout)):
+            data[f"layout-{index}-screen"] = self.screen.id
+            data[f"layout-{index}-seat_number"] = number
+
+        response = self.client.post(f"/admin/movies/screen/{self.screen.id}/change/", data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.counters(self.theater), (6, 0, 0))
+
+
+class HoldCounterTests(ShowtimeFixture, TestCase):
+    def setUp(self):
+        self.other = User.objects.create_user("other", password="pw")
+
+    def counters(self):
+        self.theater.refresh_from_db()
+        return self.theater.seats_free, self.theater.seats_held, self.theater.seats_sold
+
+    def test_holds_adjust_counters(self):
+        self.assertEqual(self.counters(), (4, 0, 0))
+        hold_seats(self.theater, self.user, ["A1", "A2"])
+        self.assertEqual(self.counters(), (2, 2, 0))
+
+        # Holding your own seats again doesn't count them twice
+        hold_seats(self.theater, self.user, ["A1"])
+        self.assertEqual(self.counters(), (2, 2, 0))
+
+        # Only the seat that was actually free is counted
+        hold_seats(self.theater, self.other, ["A2", "A3"])
+        self.assertEqual(self.counters(), (1, 3, 0))
+
+    def test_failed_hold_leaves_counters_alone(self):
+        with self.assertRaises(Http404):
+            hold_seats(self.theater, self.user, ["A1", "Z9"])
+        self.assertEqual(self.counters(), (4, 0, 0))
+
+    def test_released_holds_are_counted_free_again(self):
+        hold_seats(self.theater, self.user, ["A1", "A2"])
+        Seat.objects.filter(seat_number="A1").update(
+            reserved_at=timezone.now() - RESERVATION_TIMEOUT - timedelta(minutes=1)
+        )
+        release_stale_holds(Seat.objects.filter(theater=self.theater))
+        self.assertEqual(self.counters(), (3, 1, 0))
+
+    def test_best_seats_adjust_counters(self):
+        hold_best_seats(self.theater, self.user, 3)
+        self.assertEqual(self.counters(), (1, 3, 0))
+
+
+# =========================
+# TRACING
+# =========================
+class TracingExportTests(ShowtimeFixture, TestCase):
+    def test_unwritable_trace_dir_does_not_fail_the_request(self):
+        self.client.force_login(self.user)
+        with tempfile.NamedTemporaryFile() as not_a_dir, override_settings(
+            ADMISSION_CONTROL={"ENABLED": False},
+            TRACING={"ENABLED": True, "SAMPLE_RATE": 1.0, "DIR": not_a_dir.name},
+        ), self.assertLogs("movies.tracing", "ERROR"):
+            response = self.client.get(f"/movies/theater/{self.theater.id}/seats/book/")
+        self.assertEqual(response.status_code, 200)
+
+
+# =========================
+# BEST AVAILABLE ALLOCATION
+# =========================
+def hall(rows, columns, taken=()):
+    """Free seats for every row label x column, except the ``taken`` seat numbers."""
+    return [
+        SimpleNamespace(seat_number=f"{row}{column}", is_booked=f"{row}{column}" in taken, is_reserved=False)
+        for row in rows
+        for column in columns
+    ]
+
+
+class AllocationTests(SimpleTestCase):
+    def test_parse_seat_number(self):
+        self.assertEqual(parse_seat_number("A12"), ("A", 12))
+        self.assertEqual(parse_seat_number(" aa-3 "), ("AA", 3))
+        self.assertIsNone(parse_seat_number("VIP"))
+        self.assertIsNone(parse_seat_number("12"))
+
+    def test_prefers_the_centre_of_the_ideal_row(self):
+        # IDEAL_ROW puts the best of five rows at C
+        self.assertEqual(best_block(hall("ABCDE", range(1, 11)), 2), ["C5", "C6"])
+
+    def test_taken_seats_push_the_block_off_centre_or_to_another_row(self):
+        seats = hall("ABCDE", range(1, 11), taken={"C5", "C6"})
+        self.assertEqual(best_block(seats, 2), ["D5", "D6"])
+
+        seats = hall("C", range(1, 11), taken={"C5"})
+        self.assertEqual(best_block(seats, 3), ["C6", "C7", "C8"])
+
+    def test_aisle_breaks_a_block(self):
+        seats = hall("A", [1, 2, 3, 4, 7, 8, 9, 10])
+        self.assertIsNone(best_block(seats, 5))
+        self.assertIn(best_block(seats, 4), (["A1", "A2", "A3", "A4"], ["A7", "A8", "A9", "A10"]))
+
+    def test_block_larger_than_any_row(self):
+        self.assertIsNone(best_block(hall("AB", range(1, 11)), 11))
+        self.assertIsNone(best_block(hall("AB", range(1, 11)), 0))
+
+    def test_double_letter_rows_sort_after_z(self):
+        # A, B, AA: the ideal row is B, not AA
+        self.assertEqual(best_block(hall(["A", "B", "AA"], [1, 2]), 2), ["B1", "B2"])
+
+    def test_unparsable_seat_numbers_are_ignored(self):
+        seats = hall("A", [1, 2]) + [SimpleNamespace(seat_number="VIP", is_booked=False, is_reserved=False)]
+        self.assertEqual(best_block(seats, 2), ["A1", "A2"])
+        self.assertIsNone(best_block(seats[-1:], 1))
+
+    def test_thousand_seat_hall_stays_fast(self):
+        rows = [chr(ord("A") + index) for index in range(25)]
+        seats = hall(rows, range(1, 41), taken={f"{row}{column}" for row in rows[10:20] for column in range(15, 26)})
+
+        # About 0.5 ms per call on a developer machine. The limit only
+        # catches algorithmic regressions (e.g. rescanning a row for every
+        # window), not slow or loaded CI runners.
+        calls = 20
+        best = min(timeit.repeat(lambda: best_block(seats, 4), number=calls, repeat=5))
+        self.assertLess(best / calls, 0.02)
+
+
+class BestSeatsTests(ShowtimeFixture, TestCase):
+    def test_best_seats_are_held_together(self):
+        hold_seats(self.theater, User.objects.create_user("other", password="pw"), ["A1"])
+        self.assertEqual(hold_best_seats(self.theater, self.user, 3), ["A2", "A3", "A4"])
+        self.assertEqual(hold_best_seats(self.theater, self.user, 1), [])
+
+
+# =========================
+# SEAT STORAGE (screen layouts)
+# =========================
+class SeatStorageTests(ShowtimeFixture, TestCase):
+    def setUp(self):
+        self.other = User.objects.create_user("other", password="pw")
+
+    def stored(self):
+        return sorted(Seat.objects.filter(theater=self.theater).values_list("seat_number", flat=True))
+
+    def test_only_held_seats_are_stored(self):
+        self.assertEqual(self.stored(), [])
+        self.assertEqual(len(seat_map(self.theater)), 4)
+
+        self.assertEqual(hold_seats(self.theater, self.user, ["A1", "A2"]), [])
+        self.assertEqual(self.stored(), ["A1", "A2"])
+
+        held = [seat.seat_number for seat in seat_map(self.theater) if seat.is_reserved]
+        self.assertEqual(held, ["A1", "A2"])
+
+    def test_seat_held_by_someone_else_is_unavailable(self):
+        hold_seats(self.theater, self.user, ["A2"])
+        self.assertEqual(hold_seats(self.theater, self.other, ["A2", "A3"]), ["A2"])
+        self.assertEqual(Seat.objects.get(theater=self.theater, seat_number="A2").reserved_by, self.user)
+        self.assertEqual(Seat.objects.get(theater=self.theater, seat_number="A3").reserved_by, self.other)
+
+    def test_seat_outside_the_layout(self):
+        with self.assertRaises(Http404):
+            hold_seats(self.theater, self.user, ["Z9"])
+        self.assertEqual(self.stored(), [])
+
+    def test_stale_holds_are_deleted(self):
+        hold_seats(self.theater, self.user, ["A1", "A2"])
+        Seat.objects.filter(seat_number="A1").update(
+            reserved_at=timezone.now() - RESERVATION_TIMEOUT - timedelta(minutes=1)
+        )
+
+        self.assertEqual(release_stale_holds(Seat.objects.filter(theater=self.theater)), 1)
+        self.assertEqual(self.stored(), ["A2"])
+
+
+# =========================
+# ARCHIVE
+# =========================
+class ArchiveTests(ShowtimeFixture, TestCase):
+    def test_past_showtime_is_archived_and_read_back(self):
+        past = Theater.objects.create(
+            name="Venue", movie=self.movie, screen=self.screen, time=timezone.now() - timedelta(days=40)
+        )
+        hold_seats(past, self.user, ["A1", "A2"])
+        seat = Seat.objects.get(theater=past, seat_number="A1")
+        seat.is_booked = True
+        seat.save()
+        Booking.objects.create(
+            user=self.user, seat=seat, movie=self.movie, theater=past, is_paid=True, amount_paid=250
+        )
+
+        showtimes, seats, bookings = archive_showtimes(timezone.now() - timedelta(days=30))
+
+        self.assertEqual((showtimes, seats, bookings), (1, 2, 1))
+        past.refresh_from_db()
+        self.assertTrue(past.archived)
+        self.assertFalse(Seat.objects.filter(theater=past).exists())
+        self.assertFalse(Booking.objects.exists())
+
+        [archived] = user_bookings(self.user)
+        self.assertIsInstance(archived, ArchivedBooking)
+        self.assertEqual((archived.seat.seat_number, archived.theater), ("A1", past))
+        self.assertEqual(paid_revenue(), 250)
+
+        # The showtime that is still coming up is left alone
+        self.theater.refresh_from_db()
+        self.assertFalse(self.theater.archived)
+
+    @override_settings(ADMISSION_CONTROL={"ENABLED": False})
+    def test_archived_showtime_cannot_be_booked(self):
+        Theater.objects.filter(id=self.theater.id).update(archived=True)
+        self.client.force_login(self.user)
+        response = self.client.get(f"/movies/theater/{self.theater.id}/seats/book/")
+        self.assertEqual(response.status_code, 404)
+
+
+# =========================
+# MEDIA SERVING
+# =========================
+class ServeMediaTests(SimpleTestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        with open(os.path.join(media_root.name, "poster.jpg"), "wb") as f:
+            f.write(b"0123456789")
+
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def get(self, **headers):
+        return serve_media(RequestFactory().get("/media/poster.jpg", headers=headers), "poster.jpg")
+
+    def body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_full_file_with_validators(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), b"0123456789")
+        self.assertTrue(response["ETag"])
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_not_modified(self):
+        first = self.get()
+        self.assertEqual(self.get(if_none_match=first["ETag"]).status_code, 304)
+        self.assertEqual(self.get(if_none_match=f'"other", {first["ETag"]}').status_code, 304)
+        self.assertEqual(self.get(if_modified_since=first["Last-Modified"]).status_code, 304)
+        self.assertEqual(self.get(if_none_match='"other"').status_code, 200)
+
+    def test_weak_etag_matches(self):
+        etag = self.get()["ETag"]
+        self.assertEqual(self.get(if_none_match=f"W/{etag}").status_code, 304)
+
+    def test_byte_ranges(self):
+        response = self.get(range="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(self.body(response), b"2345")
+
+        response = self.get(range="bytes=-3")
+        self.assertEqual((response.status_code, self.body(response)), (206, b"789"))
+
+        response = self.get(range="bytes=20-")
+        self.assertEqual((response.status_code, response["Content-Range"]), (416, "bytes */10"))
+
+    def test_stale_if_range_gets_the_whole_file(self):
+        response = self.get(range="bytes=2-5", if_range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), b"0123456789")
+
+
+# =========================
+# CONSISTENCY AUDIT
+# =========================
+class AuditTests(ShowtimeFixture, TestCase):
+    def setUp(self):
+        self.legacy = Theater.objects.create(name="Legacy", movie=self.movie, time=timezone.now())
+        other_movie = Movie.objects.create(name="Other", image="movies/other.jpg", rating=7, cast="Nobody")
+        self.other = Theater.objects.create(
+            name="Venue", movie=other_movie, screen=self.screen, time=timezone.now()
+        )
+
+        def seat(theater, number, **fields):
+            return Seat.objects.create(theater=theater, seat_number=number, **fields)
+
+        def book(seat, theater=None):
+            theater = theater or seat.theater
+            return Booking.objects.create(user=self.user, seat=seat, movie=theater.movie, theater=theater)
+
+        # One row per check on each kind of showtime, where it applies
+        self.sparse_booked = seat(self.theater, "A1", is_booked=True)
+        self.dense_booked = seat(self.legacy, "B1", is_booked=True)
+        self.sparse_orphan_hold = seat(self.theater, "A2", is_reserved=True)
+        self.dense_orphan_hold = seat(self.legacy, "B2", is_reserved=True)
+        self.unbooked = book(seat(self.theater, "A3"))
+        self.misfiled = book(seat(self.theater, "A4", is_booked=True), theater=self.other)
+        # Consistent rows that must be left alone
+        book(seat(self.legacy, "B3", is_booked=True))
+        seat(self.legacy, "B4", is_reserved=True, reserved_by=self.user, reserved_at=timezone.now())
+
+    def test_audit_finds_exactly_the_violations(self):
+        self.assertEqual(audit(chunk_size=2), {
+            "booked_without_booking": [self.sparse_booked.id, self.dense_booked.id],
+            "reserved_without_user": [self.sparse_orphan_hold.id, self.dense_orphan_hold.id],
+            "booking_on_unbooked_seat": [self.unbooked.id],
+            "booking_showtime_mismatch": [self.misfiled.id],
+        })
+        self.assertEqual(audit(["reserved_without_user"]), {
+            "reserved_without_user": [self.sparse_orphan_hold.id, self.dense_orphan_hold.id],
+        })
+
+    def test_repair_fixes_everything_found(self):
+        fixed = repair(audit())
+        self.assertEqual(fixed, {
+            "booked_without_booking": 2,
+            "reserved_without_user": 2,
+            "booking_on_unbooked_seat": 1,
+            "booking_showtime_mismatch": 1,
+        })
+        self.assertEqual(audit(), {name: [] for name in fixed})
+
+        # Screen-backed rows for free seats are deleted, legacy rows reset
+        sparse = [self.sparse_booked.id, self.sparse_orphan_hold.id]
+        self.assertFalse(Seat.objects.filter(id__in=sparse).exists())
+        for seat in Seat.objects.filter(id__in=[self.dense_booked.id, self.dense_orphan_hold.id]):
+            self.assertEqual((seat.is_booked, seat.is_reserved, seat.reserved_by), (False, False, None))
+
+        self.assertTrue(Seat.objects.get(id=self.unbooked.seat_id).is_booked)
+        self.misfiled.refresh_from_db()
+        self.assertEqual((self.misfiled.theater, self.misfiled.movie), (self.theater, self.movie))
+
+        # The counters of the repaired showtimes were reconciled
+        self.theater.refresh_from_db()
+        self.legacy.refresh_from_db()
+        self.assertEqual(
+            (self.theater.seats_free, self.theater.seats_held, self.theater.seats_sold), (2, 0, 2)
+        )
+        self.assertEqual(
+            (self.legacy.seats_free, self.legacy.seats_held, self.legacy.seats_sold), (2, 1, 1)
+        )
+
+
+# =========================
+# BULK OPERATIONS
+# =========================
+class BulkOperationTests(ShowtimeFixture, TestCase):
+    def setUp(self):
+        self.bookings = []
+        for number in ("A1", "A2"):
+            seat = Seat.objects.create(theater=self.theater, seat_number=number, is_booked=True)
+            self.bookings.append(Booking.objects.create(
+                user=self.user, seat=seat, movie=self.movie, theater=self.theater
+            ))
+        reconcile()
+
+    def legacy_showtime(self, numbers=("A1", "A2", "A3", "A4")):
+        theater = Theater.objects.create(name="Legacy", movie=self.movie, time=timezone.now())
+        Seat.objects.bulk_create([Seat(theater=theater, seat_number=number) for number in numbers])
+        reconcile(Theater.objects.filter(id=theater.id))
+        return theater
+
+    def counters(self, theater):
+        theater.refresh_from_db()
+        return theater.seats_free, theater.seats_held, theater.seats_sold
+
+    def booked_seats(self):
+        return sorted(
+            Booking.objects.values_list("theater_id", "seat__theater_id", "seat__seat_number")
+        )
+
+    def booked_on(self, theater):
+        return [(theater.id, theater.id, "A1"), (theater.id, theater.id, "A2")]
+
+    def test_move_to_screen_backed_showtime_creates_seat_rows(self):
+        target = Theater.objects.create(
+            name="Venue", movie=self.movie, screen=self.screen, time=timezone.now()
+        )
+        self.assertEqual(move_bookings(self.theater, target), 2)
+
+        self.assertEqual(self.booked_seats(), self.booked_on(target))
+        booked = Seat.objects.filter(theater=target, is_booked=True)
+        self.assertEqual(sorted(booked.values_list("seat_number", flat=True)), ["A1", "A2"])
+        # Screen-backed source rows for now free seats are gone
+        self.assertFalse(Seat.objects.filter(theater=self.theater).exists())
+        self.assertEqual(self.counters(self.theater), (4, 0, 0))
+        self.assertEqual(self.counters(target), (2, 0, 2))
+
+    def test_move_to_legacy_showtime(self):
+        target = self.legacy_showtime()
+        self.assertEqual(move_bookings(self.theater, target), 2)
+
+        self.assertEqual(self.booked_seats(), self.booked_on(target))
+        self.assertEqual(Seat.objects.filter(theater=target).count(), 4)
+        self.assertEqual(self.counters(self.theater), (4, 0, 0))
+        self.assertEqual(self.counters(target), (2, 0, 2))
+
+    def assert_nothing_moved(self, target, target_counters):
+        with self.assertRaises(BulkOperationError):
+            move_bookings(self.theater, target)
+        self.assertEqual(self.booked_seats(), self.booked_on(self.theater))
+        self.assertEqual(self.counters(self.theater), (2, 0, 2))
+        self.assertEqual(self.counters(target), target_counters)
+
+    def test_taken_seat_on_target_moves_nothing(self):
+        target = Theater.objects.create(
+            name="Venue", movie=self.movie, screen=self.screen, time=timezone.now()
+        )
+        hold_seats(target, User.objects.create_user("other", password="pw"), ["A2"])
+        self.assert_nothing_moved(target, (3, 1, 0))
+        self.assertEqual(Seat.objects.filter(theater=target).count(), 1)
+
+    def test_missing_seat_on_target_moves_nothing(self):
+        target = self.legacy_showtime(numbers=("A1", "A3"))
+        self.assert_nothing_moved(target, (2, 0, 0))
+
+    def test_move_onto_itself(self):
+        with self.assertRaises(BulkOperationError):
+            move_bookings(self.theater, self.theater)
+
+    def test_clone_legacy_showtime_copies_an_empty_grid(self):
+        source = self.legacy_showtime()
+        Seat.objects.filter(theater=source, seat_number="A1").update(is_booked=True)
+
+        [clone] = clone_showtime(source, [date(2030, 1, 1)])
+
+        self.assertEqual(timezone.localtime(clone.time).date(), date(2030, 1, 1))
+        seats = Seat.objects.filter(theater=clone).order_by("seat_number")
+        self.assertEqual(
+            list(seats.values_list("seat_number", "is_booked")),
+            [("A1", False), ("A2", False), ("A3", False), ("A4", False)],
+        )
+        self.assertEqual(self.counters(clone), (4, 0, 0))
+
+    def test_clone_screen_backed_showtime_copies_no_rows(self):
+        clones = clone_showtime(self.theater, [date(2030, 1, 1), date(2030, 1, 2)])
+
+        self.assertEqual(len(clones), 2)
+        for clone in clones:
+            self.assertEqual(clone.screen, self.screen)
+            self.assertFalse(Seat.objects.filter(theater=clone).exists())
+            self.assertEqual(self.counters(clone), (4, 0, 0))
@@ -0,0 +1,309 @@
+"""
+Lightweight tracing of the booking funnel.
+
+``@traced(step)`` records one span per request to a funnel view: its wall
+time, the time spent in SQL, the part of that spent in ``SELECT ... FOR
+UPDATE`` (lock waits) and the time spent calling Stripe (``external``).
+Spans carry a trace id derived from the session, so one visitor's seat
+page, reserve, checkout and success requests can be joined up again.
+
+Sampling is decided per session, so a sampled visitor is traced through the
+whole funnel. Spans are appended as JSON lines to a rotating file per
+process in ``settings.TRACING["DIR"]``, which must be writable (``/tmp``
+on serverless hosts); ``manage.py trace_summary`` reads them back. A span
+that can't be written is dropped with a logged error, the response is
+unaffected.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from functools import wraps
+from inspect import iscoroutinefunction
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+DEFAULTS = {
+    "ENABLED": False,
+    "SAMPLE_RATE": 0.1,
+    "DIR": "traces",
+    "MAX_BYTES": 10 * 1024 * 1024,
+    "BACKUP_COUNT": 5,
+}
+
+_current = ContextVar("trace_span", default=None)
+_logger = logging.getLogger("bookmyseat.traces")
+_logger.propagate = False
+_logger_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, "TRACING", {})}
+
+
+# =========================
+# SPAN TIMERS
+# =========================
+def _record_query(execute, sql, params, many, context):
+    span = _current.get()
+    if span is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        span["db_ms"] += elapsed
+        span["queries"] += 1
+        if "FOR UPDATE" in sql:
+            span["lock_ms"] += elapsed
+
+
+def _install_wrapper(sender, connection, **kwargs):
+    # Cheap when nothing is being traced: one ContextVar lookup per query
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+connection_created.connect(_install_wrapper)
+
+
+@contextmanager
+def external(service):
+    """Time a call to an outside service (e.g. Stripe) in the current span."""
+    span = _current.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if span is not None:
+            span["external_ms"] += (time.perf_counter() - started) * 1000
+            span["external"] = service
+
+
+# =========================
+# SAMPLING + EXPORT
+# =========================
+def _trace_id(request):
+    key = request.session.session_key if hasattr(request, "session") else None
+    if not key:
+        return None
+    return hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()[:16]
+
+
+def _sampled(trace_id, rate):
+    # Same decision for every request of a session
+    return int(trace_id[:8], 16) / 0xFFFFFFFF < rate
+
+
+def _open_export(config):
+    with _logger_lock:
+        if not _logger.handlers:
+            os.makedirs(config["DIR"], exist_ok=True)
+            handler = RotatingFileHandler(
+                os.path.join(config["DIR"], f"spans.{os.getpid()}.jsonl"),
+                maxBytes=config["MAX_BYTES"],
+                backupCount=config["BACKUP_COUNT"],
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _logger.addHandler(handler)
+            _logger.setLevel(logging.INFO)
+
+
+def _export(span, config):
+    # Tracing must never turn a response into a 500 (read-only or full disk)
+    try:
+        _open_export(config)
+        _logger.info(json.dumps(span))
+    except Exception:
+        logger.exception("Could not export span to %s", config["DIR"])
+
+
+def _start(request, step, config):
+    trace_id = _trace_id(request)
+    if trace_id is None or not _sampled(trace_id, config["SAMPLE_RATE"]):
+        return None, None
+
+    # Connections opened before this module was imported
+    for connection in connections.all(initialized_only=True):
+        _install_wrapper(None, connection)
+
+    span = {
+        "trace": trace_id,
+        "step": step,
+        "method": request.method,
+        "path": request.path,
+        "start": timezone.now().isoformat(),
+        "db_ms": 0.0,
+        "queries": 0,
+        "lock_ms": 0.0,
+        "external_ms": 0.0,
+    }
+    return span, _current.set(span)
+
+
+def _finish(span, token, started, user, response, config):
+    _current.reset(token)
+    span["user"] = user.pk
+    span["status"] = response.status_code if response is not None else 500
+    span["duration_ms"] = (time.perf_counter() - started) * 1000
+    for key in ("db_ms", "lock_ms", "external_ms", "duration_ms"):
+        span[key] = round(span[key], 2)
+    _export(span, config)
+
+
+def traced(step, post=None):
+    """Record a span named ``step`` (``post`` for POSTs) for each sampled request to the view."""
+
+    def step_for(request):
+        return post if post and request.method == "POST" else step
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                config = _config()
+                if not config["ENABLED"]:
+                    return await view(request, *args, **kwargs)
+
+                span, token = _start(request, step_for(request), config)
+                if span is None:
+                    return await view(request, *args, **kwargs)
+
+                started = time.perf_counter()
+                response = None
+                try:
+                    response = await view(request, *args, **kwargs)
+                    return response
+                finally:
+                    _finish(span, token, started, await request.auser(), response, config)
+
+            return wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            config = _config()
+            if not config["ENABLED"]:
+                return view(request, *args, **kwargs)
+
+            span, token = _start(request, step_for(request), config)
+            if span is None:
+                return view(request, *args, **kwargs)
+
+            started = time.perf_counter()
+            response = None
+            try:
+                response = view(request, *args, **kwargs)
+                return response
+            finally:
+                _finish(span, token, started, request.user, response, config)
+
+        return wrapper
+
+    return decorator
+
+
+# =========================
+# SUMMARY (manage.py trace_summary)
+# =========================
+# "stripe" is not a span: it is the time between leaving checkout and
+# coming back to payment_success, i.e. the time spent on Stripe's page
+FUNNEL = ["seat_page", "reserve", "checkout", "stripe", "payment_success"]
+
+
+def read_spans(directory=None, since=None):
+    """Every span exported to ``directory`` (default: the configured one), oldest file first."""
+    directory = directory or _config()["DIR"]
+    spans = []
+    if not os.path.isdir(directory):
+        return spans
+
+    names = [name for name in os.listdir(directory) if name.startswith("spans.")]
+    names.sort(key=lambda name: os.path.getmtime(os.path.join(directory, name)))
+
+    for name in names:
+        with open(os.path.join(directory, name)) as f:
+            for line in f:
+                try:
+                    span = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a crash / rotation
+                if since is None or span["start"] >= since.isoformat():
+                    spans.append(span)
+    return spans
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def _stripe_waits(spans):
+    """Spans for the time each trace spent on Stripe's payment page."""
+    by_trace = {}
+    for span in spans:
+        by_trace.setdefault(span["trace"], []).append(span)
+
+    waits = []
+    for trace, trace_spans in by_trace.items():
+        trace_spans.sort(key=lambda span: span["start"])
+        left_at = None
+        for span in trace_spans:
+            start = datetime.fromisoformat(span["start"])
+            if span["step"] == "checkout" and span["status"] == 302:
+                left_at = start + timedelta(milliseconds=span["duration_ms"])
+            elif span["step"] == "payment_success" and left_at is not None:
+                waits.append({
+                    "trace": trace,
+                    "step": "stripe",
+                    "duration_ms": (start - left_at).total_seconds() * 1000,
+                })
+                left_at = None
+    return waits
+
+
+def summarize(spans):
+    """Latency percentiles per funnel step and how many traces reached it."""
+    by_step = {step: [] for step in FUNNEL}
+    for span in spans + _stripe_waits(spans):
+        by_step.setdefault(span["step"], []).append(span)
+
+    entered = len({span["trace"] for span in by_step[FUNNEL[0]]})
+    steps = []
+    for step, step_spans in by_step.items():
+        traces = len({span["trace"] for span in step_spans})
+        summary = {
+            "step": step,
+            "spans": len(step_spans),
+            "traces": traces,
+            "reached_pct": round(traces / entered * 100, 1) if entered else None,
+        }
+        if step_spans:
+            durations = [span["duration_ms"] for span in step_spans]
+            summary.update({
+                "p50_ms": round(_percentile(durations, 50), 1),
+                "p95_ms": round(_percentile(durations, 95), 1),
+                "p99_ms": round(_percentile(durations, 99), 1),
+            })
+            for key in ("db_ms", "lock_ms", "external_ms"):
+                values = [span[key] for span in step_spans if key in span]
+                if values:
+                    summary[f"avg_{key}"] = round(sum(values) / len(values), 1)
+        steps.append(summary)
+
+    timed = [summary for summary in steps if "p95_ms" in summary]
+    slowest = max(timed, key=lambda summary: summary["p95_ms"])["step"] if timed else None
+    return {"spans": len(spans), "traces": entered, "steps": steps, "slowest_step": slowest}
@@ -1,22 +1,32 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Under ASGI the catalog, seat and payment pages are served by async views
+if settings.ASYNC_VIEWS:
+    from . import async_views as catalog_views
+else:
+    catalog_views = views
+
 urlpatterns = [
 
     # Movie listing + filters
-    path('', views.movie_list, name='movie_list'),
+    path('', catalog_views.movie_list, name='movie_list'),
 
     # Theater listing for a movie
-    path('<int:movie_id>/theaters/', views.theater_list, name='theater_list'),
+    path('<int:movie_id>/theaters/', catalog_views.theater_list, name='theater_list'),
+
+    # Showtimes of every movie in a date / time window
+    path('showtimes/', views.showtime_search, name='showtime_search'),
 
     # Seat selection + reservation
-    path('theater/<int:theater_id>/seats/book/', views.book_seats, name='book_seats'),
+    path('theater/<int:theater_id>/seats/book/', catalog_views.book_seats, name='book_seats'),
 
     # Stripe Checkout
     path('checkout/<int:theater_id>/', views.create_checkout_session, name='checkout'),
 
     # Payment result pages
-    path('payment-success/', views.payment_success, name='payment_success'),
+    path('payment-success/', catalog_views.payment_success, name='payment_success'),
     path('payment-cancel/', views.payment_cancel, name='payment_cancel'),
 
     # Admin Analytics Dashboard
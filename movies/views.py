@@ -1,19 +1,28 @@
-from django.utils import timezone
 from django.shortcuts import render, redirect, get_object_or_404
-from .models import Movie, Theater, Seat, Booking
+from .models import Movie, Theater, Seat
+from .bulk import release_stale_holds
+from .allocation import MAX_BLOCK_SIZE
+from .archive import paid_bookings_by, paid_revenue
+from .seating import hold_best_seats, hold_seats, seat_map
+from .admission import admission_control
+from .payments import get_stripe, fulfil_checkout
+from .recommendations import also_booked
+from .tracing import external, traced
+from .showtimes import (
+    group_by_date_and_venue,
+    paginate,
+    parse_window,
+    showtimes_between,
+    upcoming_showtimes,
+)
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Sum
-from django.core.mail import send_mail
-from django.conf import settings
-import stripe
-
-stripe.api_key = settings.STRIPE_SECRET_KEY
+from bookmyseat.db_router import read_replica
 
 
 # =========================
 # MOVIE LIST + FILTERS
 # =========================
-def movie_list(request):
+def filter_movies(request):
     movies = Movie.objects.all()
 
     search_query = request.GET.get("search")
@@ -29,21 +38,52 @@ def movie_list(request):
     if language:
         movies = movies.filter(language=language)
 
+    return movies
+
+
+@read_replica
+def movie_list(request):
     return render(request, "movies/movie_list.html", {
-        "movies": movies
+        "movies": filter_movies(request),
+        "genre_choices": Movie.GENRE_CHOICES,
+        "language_choices": Movie.LANGUAGE_CHOICES,
     })
 
 
 # =========================
 # THEATER LIST
 # =========================
+@read_replica
 def theater_list(request, movie_id):
     movie = get_object_or_404(Movie, id=movie_id)
-    theaters = Theater.objects.filter(movie=movie)
+    page = paginate(
+        upcoming_showtimes(Theater.objects.filter(movie=movie)),
+        request.GET.get("page"),
+    )
 
     return render(request, "movies/theater_list.html", {
         "movie": movie,
-        "theaters": theaters
+        "theaters": page.object_list,
+        "showtime_groups": group_by_date_and_venue(page.object_list),
+        "page_obj": page,
+        "also_booked": also_booked(movie)
+    })
+
+
+# =========================
+# SHOWTIME SEARCH (All movies, one evening)
+# =========================
+@read_replica
+def showtime_search(request):
+    day, start, end = parse_window(request.GET)
+    page = paginate(showtimes_between(day, start, end), request.GET.get("page"))
+
+    return render(request, "movies/showtime_search.html", {
+        "day": day,
+        "start": start,
+        "end": end,
+        "showtime_groups": group_by_date_and_venue(page.object_list),
+        "page_obj": page
     })
 
 
@@ -51,58 +91,22 @@ def theater_list(request, movie_id):
 # SEAT RESERVATION
 # =========================
 @login_required(login_url="/login/")
+@traced("seat_page", post="reserve")
+@admission_control
 def book_seats(request, theater_id):
-    theater = get_object_or_404(Theater, id=theater_id)
-    seats = Seat.objects.filter(theater=theater)
+    theater = get_object_or_404(Theater, id=theater_id, archived=False)
 
     # Auto-release expired reservations
-    for seat in seats:
-        if seat.is_reserved and seat.is_reservation_expired():
-            seat.is_reserved = False
-            seat.reserved_at = None
-            seat.reserved_by = None
-            seat.save()
+    release_stale_holds(Seat.objects.filter(theater=theater))
 
     if request.method == "POST":
-        selected_seats = request.POST.getlist("seats")
-        error_seats = []
-
-        if not selected_seats:
-            return render(request, "movies/seat_selection.html", {
-                "theaters": theater,
-                "seats": seats,
-                "error": "No seat selected"
-            })
-
-        for seat_id in selected_seats:
-            seat = get_object_or_404(Seat, id=seat_id, theater=theater)
-
-            if seat.is_booked:
-                error_seats.append(seat.seat_number)
-                continue
-
-            if seat.is_reserved and seat.reserved_by != request.user:
-                error_seats.append(seat.seat_number)
-                continue
-
-            seat.is_reserved = True
-            seat.reserved_at = timezone.now()
-            seat.reserved_by = request.user
-            seat.save()
-
-        if error_seats:
-            return render(request, "movies/seat_selection.html", {
-                "theaters": theater,
-                "seats": seats,
-                "error": f"Unavailable seats: {', '.join(error_seats)}"
-            })
-
-        return redirect("checkout", theater_id=theater.id)
+        return reserve_selected_seats(request, theater)
 
-    can_pay = seats.filter(
-        is_reserved=True,
-        reserved_by=request.user
-    ).exists()
+    seats = seat_map(theater)
+    can_pay = any(
+        seat.is_reserved and seat.reserved_by_id == request.user.id
+        for seat in seats
+    )
 
     return render(request, "movies/seat_selection.html", {
         "theaters": theater,
@@ -111,21 +115,62 @@ def book_seats(request, theater_id):
     })
 
 
+def reserve_selected_seats(request, theater):
+    if request.POST.get("best_count"):
+        return reserve_best_seats(request, theater)
+
+    selected_seats = request.POST.getlist("seats")
+
+    if not selected_seats:
+        return render(request, "movies/seat_selection.html", {
+            "theaters": theater,
+            "seats": seat_map(theater),
+            "error": "No seat selected"
+        })
+
+    error_seats = hold_seats(theater, request.user, selected_seats)
+
+    if error_seats:
+        return render(request, "movies/seat_selection.html", {
+            "theaters": theater,
+            "seats": seat_map(theater),
+            "error": f"Unavailable seats: {', '.join(error_seats)}"
+        })
+
+    return redirect("checkout", theater_id=theater.id)
+
+
+def reserve_best_seats(request, theater):
+    try:
+        count = int(request.POST["best_count"])
+    except ValueError:
+        count = 0
+
+    if not 1 <= count <= MAX_BLOCK_SIZE:
+        error = f"Choose between 1 and {MAX_BLOCK_SIZE} seats"
+    elif hold_best_seats(theater, request.user, count):
+        return redirect("checkout", theater_id=theater.id)
+    else:
+        error = f"No {count} seats together are available"
+
+    return render(request, "movies/seat_selection.html", {
+        "theaters": theater,
+        "seats": seat_map(theater),
+        "error": error
+    })
+
+
 # =========================
 # STRIPE CHECKOUT
 # =========================
 @login_required
+@traced("checkout")
+@admission_control
 def create_checkout_session(request, theater_id):
-    theater = get_object_or_404(Theater, id=theater_id)
+    theater = get_object_or_404(Theater, id=theater_id, archived=False)
 
     # Auto-release expired reservations
-    all_seats = Seat.objects.filter(theater=theater)
-    for seat in all_seats:
-        if seat.is_reserved and seat.is_reservation_expired():
-            seat.is_reserved = False
-            seat.reserved_by = None
-            seat.reserved_at = None
-            seat.save()
+    release_stale_holds(Seat.objects.filter(theater=theater))
 
     seats = Seat.objects.filter(
         theater=theater,
@@ -136,24 +181,27 @@ def create_checkout_session(request, theater_id):
     if not seats.exists():
         return redirect("movie_list")
 
-    checkout_session = stripe.checkout.Session.create(
-        payment_method_types=["card"],
-        line_items=[{
-            "price_data": {
-                "currency": "usd",
-                "product_data": {
-                    "name": f"Tickets for {theater.movie.name}"
-                },
-                "unit_amount": 1000,  # $10 per seat
+    line_items = [{
+        "price_data": {
+            "currency": "usd",
+            "product_data": {
+                "name": f"Tickets for {theater.movie.name}"
             },
-            "quantity": seats.count(),
-        }],
-        mode="payment",
-        success_url=request.build_absolute_uri(
-            "/payment-success/"
-        ) + "?session_id={CHECKOUT_SESSION_ID}",
-        cancel_url=request.build_absolute_uri("/payment-cancel/"),
-    )
+            "unit_amount": 1000,  # $10 per seat
+        },
+        "quantity": seats.count(),
+    }]
+
+    with external("stripe"):
+        checkout_session = get_stripe().checkout.Session.create(
+            payment_method_types=["card"],
+            line_items=line_items,
+            mode="payment",
+            success_url=request.build_absolute_uri(
+                "/payment-success/"
+            ) + "?session_id={CHECKOUT_SESSION_ID}",
+            cancel_url=request.build_absolute_uri("/payment-cancel/"),
+        )
 
     return redirect(checkout_session.url)
 
@@ -162,50 +210,18 @@ def create_checkout_session(request, theater_id):
 # PAYMENT SUCCESS
 # =========================
 @login_required
+@traced("payment_success")
 def payment_success(request):
     session_id = request.GET.get("session_id")
 
     if not session_id:
         return redirect("movie_list")
 
-    session = stripe.checkout.Session.retrieve(session_id)
+    with external("stripe"):
+        session = get_stripe().checkout.Session.retrieve(session_id)
 
     if session.payment_status == "paid":
-
-        seats = Seat.objects.filter(
-            is_reserved=True,
-            reserved_by=request.user
-        )
-
-        if seats.exists() and not Booking.objects.filter(payment_id=session.payment_intent).exists():
-            movie_name = seats.first().theater.movie.name
-            total_amount = 10 * seats.count()
-
-            for seat in seats:
-                Booking.objects.create(
-                    user=request.user,
-                    seat=seat,
-                    movie=seat.theater.movie,
-                    theater=seat.theater,
-                    is_paid=True,
-                    payment_id=session.payment_intent,
-                    amount_paid=10
-                )
-
-                seat.is_reserved = False
-                seat.is_booked = True
-                seat.reserved_by = None
-                seat.save()
-
-            # Email Confirmation
-            if request.user.email:
-                send_mail(
-                    subject="Booking Confirmation",
-                    message=f"Your booking for {movie_name} is confirmed.",
-                    from_email=None,
-                    recipient_list=[request.user.email],
-                    fail_silently=True,
-                )
+        fulfil_checkout(request.user, session.payment_intent)
 
     return render(request, "movies/payment_success.html")
 
@@ -222,27 +238,15 @@ def payment_cancel(request):
 # ADMIN DASHBOARD
 # =========================
 @login_required
+@read_replica
 def admin_dashboard(request):
     if not request.user.is_superuser:
         return redirect("movie_list")
 
-    total_revenue = Booking.objects.filter(is_paid=True).aggregate(
-        total=Sum("amount_paid")
-    )["total"] or 0
-
-    popular_movies = (
-        Booking.objects.filter(is_paid=True)
-        .values("movie__name")
-        .annotate(total=Count("id"))
-        .order_by("-total")[:5]
-    )
-
-    busiest_theaters = (
-        Booking.objects.filter(is_paid=True)
-        .values("theater__name")
-        .annotate(total=Count("id"))
-        .order_by("-total")[:5]
-    )
+    # Includes bookings of archived showtimes
+    total_revenue = paid_revenue()
+    popular_movies = paid_bookings_by("movie__name")
+    busiest_theaters = paid_bookings_by("theater__name")
 
     return render(request, "movies/admin_dashboard.html", {
         "total_revenue": total_revenue,
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        # Connects the signals that drop cached users (see bookmyseat/auth.py)
+        from bookmyseat import auth  # noqa: F401
@@ -0,0 +1,33 @@
+"""
+Async version of the profile page, used when the site runs under ASGI
+(see ``settings.ASYNC_VIEWS``).
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render, redirect
+
+from movies.archive import auser_bookings
+from movies.recommendations import arecommended_for
+from .forms import UserUpdateForm
+
+
+@login_required
+async def profile(request):
+    request.user = await request.auser()
+
+    if request.method == 'POST':
+        u_form = UserUpdateForm(request.POST, instance=request.user)
+        if await sync_to_async(u_form.is_valid)():
+            await sync_to_async(u_form.save)()
+            return redirect('profile')
+    else:
+        u_form = UserUpdateForm(instance=request.user)
+
+    bookings = await auser_bookings(request.user)
+
+    return render(request, 'users/profile.html', {
+        'u_form': u_form,
+        'bookings': bookings,
+        'recommended': await arecommended_for(request.user),
+    })
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from bookmyseat.sessions import PURGE_BATCH, purge_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired sessions from the database in small batches, so the "
+        "session table doesn't keep growing. Safe to run while the site is up."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PURGE_BATCH,
+            help=f"Sessions deleted per statement (default: {PURGE_BATCH})",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        def progress(deleted):
+            self.stdout.write(f"  deleted {deleted}")
+
+        deleted = purge_expired(batch_size=options["batch_size"], progress=progress)
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired session(s)."))
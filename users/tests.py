@@ -1,3 +1,111 @@
-from django.test import TestCase
+from django.contrib.auth import HASH_SESSION_KEY
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from bookmyseat.sessions import SessionStore
+
+from .forms import UserUpdateForm
+
+
+# =========================
+# CACHED AUTHENTICATED USER
+# =========================
+@override_settings(AUTH_USER_CACHE_SECONDS=300)
+class CachedUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("viewer", "viewer@example.com", "old-password")
+        self.client.force_login(self.user)
+        self.cache_key = f"auth:user:{self.user.pk}"
+
+    def get_profile(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/profile/")
+        user_queries = [query["sql"] for query in queries if 'FROM "auth_user"' in query["sql"]]
+        return response, user_queries
+
+    def test_second_request_is_served_from_the_cache(self):
+        response, user_queries = self.get_profile()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(user_queries), 1)
+        self.assertIsNotNone(cache.get(self.cache_key))
+
+        response, user_queries = self.get_profile()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(user_queries, [])
+
+    def test_profile_update_drops_the_cached_user(self):
+        self.get_profile()
+        form = UserUpdateForm({"username": "renamed", "email": "new@example.com"}, instance=self.user)
+        self.assertTrue(form.is_valid())
+        form.save()
+
+        self.assertIsNone(cache.get(self.cache_key))
+        response, _ = self.get_profile()
+        self.assertEqual(response.context["user"].username, "renamed")
+
+    def test_password_change_logs_the_session_out(self):
+        self.get_profile()
+        self.user.set_password("new-password")
+        self.user.save()
+
+        self.assertIsNone(cache.get(self.cache_key))
+        response, _ = self.get_profile()
+        self.assertEqual(response.status_code, 302)
+
+    def test_deactivated_user_is_logged_out(self):
+        self.get_profile()
+        self.user.is_active = False
+        self.user.save()
+
+        response, _ = self.get_profile()
+        self.assertEqual(response.status_code, 302)
+
+    def test_session_with_a_wrong_auth_hash_is_rejected(self):
+        self.get_profile()
+        self.assertIsNotNone(cache.get(self.cache_key))
+
+        session = self.client.session
+        session[HASH_SESSION_KEY] = "not-the-hash"
+        session.save()
+
+        response, _ = self.get_profile()
+        self.assertEqual(response.status_code, 302)
+
+
+# =========================
+# WRITE-BEHIND SESSIONS
+# =========================
+@override_settings(SESSION_WRITE_BEHIND_SECONDS=60)
+class WriteBehindSessionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def stored(self, session):
+        return SessionStore().decode(Session.objects.get(session_key=session.session_key).session_data)
+
+    def test_database_is_written_once_per_interval(self):
+        session = SessionStore()
+        session["step"] = 1
+        session.save()  # Creating the session starts the interval
+        self.assertEqual(self.stored(session), {"step": 1})
+
+        with CaptureQueriesContext(connection) as queries:
+            for step in range(2, 6):
+                session["step"] = step
+                session.save()
+        self.assertEqual([query for query in queries if "django_session" in query["sql"]], [])
+
+        # Reads see the latest value from the cache, the table lags behind
+        self.assertEqual(SessionStore(session.session_key)["step"], 5)
+        self.assertEqual(self.stored(session), {"step": 1})
+
+        # Once the interval is over the next save reaches the database
+        cache.delete(session._flush_key())
+        session["step"] = 6
+        session.save()
+        self.assertEqual(self.stored(session), {"step": 6})
@@ -1,6 +1,10 @@
 from django.urls import path
 from .views import register, login_view, profile, reset_password, home
 from django.contrib.auth import views as auth_views
+from django.conf import settings
+
+if settings.ASYNC_VIEWS:
+    from .async_views import profile
 
 class CustomLogoutView(auth_views.LogoutView):
     def get(self, request, *args, **kwargs):
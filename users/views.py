@@ -3,11 +3,15 @@ from .forms import UserRegisterForm, UserUpdateForm
 from django.shortcuts import render,redirect
 from django.contrib.auth import login,authenticate
 from django.contrib.auth.decorators import login_required
-from movies.models import Movie , Booking
+from movies.models import Movie
+from movies.archive import user_bookings
+from movies.recommendations import recommended_for
+from bookmyseat.db_router import read_replica
 
+@read_replica
 def home(request):
     movies= Movie.objects.all()
-    return render(request,'home.html',{'movies':movies})
+    return render(request,'home.html',{'movies':movies,'recommended':recommended_for(request.user)})
 def register(request):
     if request.method == 'POST':
         form=UserRegisterForm(request.POST)
@@ -35,7 +39,7 @@ def login_view(request):
 
 @login_required
 def profile(request):
-    bookings= Booking.objects.filter(user=request.user)
+    bookings= user_bookings(request.user)
     if request.method == 'POST':
         u_form = UserUpdateForm(request.POST, instance=request.user)
         if u_form.is_valid():
@@ -44,7 +48,11 @@ def profile(request):
     else:
         u_form = UserUpdateForm(instance=request.user)
 
-    return render(request, 'users/profile.html', {'u_form': u_form,'bookings':bookings})
+    return render(request, 'users/profile.html', {
+        'u_form': u_form,
+        'bookings': bookings,
+        'recommended': recommended_for(request.user),
+    })
 
 @login_required
 def reset_password(request):